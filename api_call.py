@@ -1,38 +1,219 @@
-import requests
-import pandas as pd
-import webbrowser
+"""
+Reusable JSON API fetcher.
+
+Fetcher keeps one pooled keep-alive session per worker thread, runs up to
+`max_workers` requests at a time, retries connection errors, 429 and 5xx
+responses with exponential backoff, and decodes JSON arrays incrementally
+from the response stream into DataFrames of `batch_size` records, so a large
+response is never held as one parsed list.
+
+Run as a script it fetches the posts of jsonplaceholder.typicode.com into
+posts_data.csv and posts_data.html. For offline runs and benchmarks see
+stub_server.py.
+"""
+
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-url = "https://jsonplaceholder.typicode.com/posts"
-response = requests.get(url)
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+URL = "https://jsonplaceholder.typicode.com/posts"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
-if response.status_code == 200:
-    data = response.json()
-    # Convert the JSON data to a pandas DataFrame
-    df = pd.DataFrame(data)
-    # Store the DataFrame in a CSV file
-    df.to_csv("posts_data.csv", index=False)
-    print("Data fetched successfully:")
-    # Print the first few rows of the DataFrame
-    print(df.head())
-else:
-    print(f"Failed to fetch data. Status code: {response.status_code}")
 
-# show only specific columns
-df = df[["userId", "title", "body"]]
-# Convert DataFrame to HTML table and open in browser
-data_html = df.to_html(index=False)
+# =============== Streaming JSON ===============
+def iter_json_records(chunks):
+    """
+    Yield the items of a top-level JSON array as text `chunks` arrive.
+    Any other top-level value is yielded as a single record.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    in_array = None
+    chunks = iter(chunks)
+    finished = False
+    while True:
+        # Skip whitespace and array punctuation
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer):
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                if in_array:
+                    pos += 1
+                    continue
+            if in_array and buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+            else:
+                # A value is complete once its delimiter has arrived ("1500."
+                # decodes as 1500 but may continue in the next chunk)
+                after = end
+                while after < len(buffer) and buffer[after] in " \t\r\n":
+                    after += 1
+                if finished or (
+                    in_array and after < len(buffer) and buffer[after] in ",]"
+                ):
+                    yield record
+                    pos = end
+                    if not in_array:
+                        return
+                    continue
+        elif finished:
+            if in_array:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            return
+        chunk = next(chunks, None)
+        if chunk is None:
+            finished = True
+            continue
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_batches(records, batch_size):
+    """DataFrames of up to `batch_size` records"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+# =============== Fetcher ===============
+class Fetcher:
+    def __init__(
+        self, max_workers=8, retries=3, backoff=0.5, timeout=10, batch_size=1000
+    ):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._sessions = []
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        """
+        Worker threads shared by every call, so their keep-alive sessions
+        (one per thread) are reused instead of rebuilt per call
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._pool
 
-html_file = "posts_data.html"
+    def session(self):
+        """Keep-alive session of the calling thread"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET"}),
+            )
+            adapter = HTTPAdapter(max_retries=retry, pool_maxsize=self.max_workers)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
 
-# === For better looking HTML file with Bootstrap CSS
+    def get(self, url, params=None, stream=False):
+        """GET `url`; raises requests exceptions once the retries are used up"""
+        response = self.session().get(
+            url, params=params, stream=stream, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response
 
-html_template = f"""
+    def get_json(self, url, params=None):
+        return self.get(url, params).json()
+
+    def iter_frames(self, url, params=None):
+        """Stream `url` and yield its records as DataFrames of batch_size rows"""
+        with self.get(url, params, stream=True) as response:
+            response.encoding = response.encoding or "utf-8"
+            chunks = response.iter_content(chunk_size=64 * 1024, decode_unicode=True)
+            yield from iter_batches(iter_json_records(chunks), self.batch_size)
+
+    def fetch_frame(self, url, params=None):
+        frames = list(self.iter_frames(url, params))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def fetch_many(self, urls):
+        """One DataFrame per URL (same order), fetched concurrently"""
+        return list(self._executor().map(self.fetch_frame, urls))
+
+    def fetch_pages(
+        self, url, limit=100, page_param="_page", limit_param="_limit", max_pages=None
+    ):
+        """
+        Fetch a paginated endpoint `max_workers` pages at a time until a page
+        comes back short, and return all rows as one DataFrame.
+        """
+        frames = []
+        page = 1
+        pool = self._executor()
+        while max_pages is None or page <= max_pages:
+            last = page + self.max_workers
+            if max_pages is not None:
+                last = min(last, max_pages + 1)
+            window = [{page_param: p, limit_param: limit} for p in range(page, last)]
+            pages = list(pool.map(lambda params: self.fetch_frame(url, params), window))
+            frames.extend(pages)
+            if any(len(frame) < limit for frame in pages):
+                break
+            page = last
+        frames = [frame for frame in frames if len(frame)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            sessions, self._sessions = self._sessions, []
+            self._local = threading.local()
+        if pool is not None:
+            pool.shutdown(wait=True)
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============== Report ===============
+def write_posts_report(df, html_file="posts_data.html"):
+    # show only specific columns
+    df = df[["userId", "title", "body"]]
+
+    # === For better looking HTML file with Bootstrap CSS
+    html_template = f"""
 <html>
     <head>
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css">
-          <style>   
+          <style>
             th {{
                 text-align: center;
             }}
@@ -40,7 +221,7 @@ html_template = f"""
                 text-align: center;
             }}
              /* Left align only title and body columns */
-            td:nth-child(2), 
+            td:nth-child(2),
             td:nth-child(3) {{
                 text-align: left;
             }}
@@ -48,16 +229,34 @@ html_template = f"""
     </head>
     <body>
         <div class="container">
-            <h2>Post List</h2>                    
+            <h2>Post List</h2>
             {df.to_html(classes="table table-striped table-bordered", index=False)}
         </div>
     </body>
 </html>
 """
 
-# Write the HTML content to a file
-with open(html_file, "w") as f:
-    f.write(html_template)
+    # Write the HTML content to a file
+    with open(html_file, "w") as f:
+        f.write(html_template)
+    return html_file
+
+
+if __name__ == "__main__":
+    import webbrowser
+
+    with Fetcher() as fetcher:
+        try:
+            df = fetcher.fetch_frame(URL)
+        except requests.RequestException as e:
+            raise SystemExit(f"Failed to fetch data: {e}")
+
+    # Store the DataFrame in a CSV file
+    df.to_csv("posts_data.csv", index=False)
+    print("Data fetched successfully:")
+    # Print the first few rows of the DataFrame
+    print(df.head())
 
-# Open the HTML file in the default web browser
-webbrowser.open(f"file://{os.path.abspath(html_file)}")
+    html_file = write_posts_report(df)
+    # Open the HTML file in the default web browser
+    webbrowser.open(f"file://{os.path.abspath(html_file)}")
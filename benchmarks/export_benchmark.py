@@ -0,0 +1,96 @@
+"""
+Export formats: write time, read time and size against the CSV dumps.
+
+Each bundled CSV (and a synthetic 1M-row indicator frame) is parsed once,
+then written and read back in every available format (see frame_export.py;
+Parquet and Feather only when pyarrow is installed). "cols mmap" opens the
+memory-mapped columns and sums Close without building a DataFrame.
+
+Run from the repository root:
+    python3 -m benchmarks.export_benchmark
+"""
+
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import synthetic_panel
+from frame_export import available_formats, export_frame, import_frame, read_columns
+
+CSV_FILES = [
+    "TATAMOTORS.NS_stock_data.csv",
+    "OLAELEC.NS_stock_data.csv",
+    "stock_data.csv",
+]
+SYNTHETIC_ROWS = 1_000_000
+RUNS = 5
+EXTENSIONS = {
+    "csv": ".csv",
+    "cols": ".cols",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+
+def synthetic_frame(n_rows):
+    close = synthetic_panel(1, n_dates=n_rows)[:, 0]
+    index = pd.date_range(
+        "2000-01-03 09:15", periods=n_rows, freq="min", tz="Asia/Kolkata"
+    )
+    data = pd.DataFrame(
+        {"Close": close, "Volume": np.int64(1_000)}, index=index.rename("Date")
+    )
+    for column in ["Open", "High", "Low", "50MA", "200MA", "RSI", "MACD"]:
+        data[column] = close
+    return data
+
+
+def size_of(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def median_time(fn, runs=RUNS):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench(name, data, folder, runs=RUNS):
+    for fmt in available_formats():
+        path = os.path.join(folder, "bench" + EXTENSIONS[fmt])
+        write_s = median_time(lambda: export_frame(data, path), runs)
+        read_s = median_time(lambda: import_frame(path), runs)
+        print(
+            f"{name:30} {fmt:8} {write_s * 1000:10.1f} {read_s * 1000:10.1f} "
+            f"{size_of(path) / 2**20:9.2f}"
+        )
+        if fmt == "cols":
+            mmap_s = median_time(lambda: read_columns(path)[1]["Close"].sum())
+            print(f"{name:30} {'cols mmap':8} {'-':>10} {mmap_s * 1000:10.1f}")
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    print(f"{'data':30} {'format':8} {'write ms':>10} {'read ms':>10} {'size MB':>9}")
+    with tempfile.TemporaryDirectory() as folder:
+        for csv_path in CSV_FILES:
+            bench(csv_path, import_frame(csv_path), folder)
+        bench(
+            f"synthetic {SYNTHETIC_ROWS:,} rows",
+            synthetic_frame(SYNTHETIC_ROWS),
+            folder,
+            runs=1,  # one CSV write of 1M rows takes tens of seconds
+        )
@@ -0,0 +1,72 @@
+"""
+Offline fetch throughput: the old one-request-at-a-time pattern vs Fetcher.
+
+Both pull every page of the local stub posts API (stub_server.py, with a
+per-response delay standing in for network latency). "before" issues a new
+requests.get per page, without a session; "after" uses Fetcher with its
+pooled sessions and concurrent pages. A second run makes the stub fail
+every 7th request to show the retries.
+
+Run from the repository root:
+    python3 -m benchmarks.fetch_benchmark
+"""
+
+import time
+
+import pandas as pd
+import requests
+
+from api_call import Fetcher
+from stub_server import StubServer
+
+N_POSTS = 5000
+PAGE_SIZE = 100
+LATENCY = 0.02
+
+
+def fetch_sequential(url):
+    frames = []
+    page = 1
+    while True:
+        response = requests.get(url, params={"_page": page, "_limit": PAGE_SIZE})
+        response.raise_for_status()
+        frame = pd.DataFrame(response.json())
+        frames.append(frame)
+        if len(frame) < PAGE_SIZE:
+            return pd.concat(frames, ignore_index=True)
+        page += 1
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with StubServer(n_posts=N_POSTS, latency=LATENCY) as server:
+        url = server.url + "/posts"
+        before, before_s = timed(lambda: fetch_sequential(url))
+        with Fetcher(max_workers=8) as fetcher:
+            after, after_s = timed(lambda: fetcher.fetch_pages(url, limit=PAGE_SIZE))
+        assert before.equals(after)
+
+    with StubServer(n_posts=N_POSTS, latency=LATENCY, fail_every=7) as server:
+        with Fetcher(max_workers=8, backoff=0.01) as fetcher:
+            flaky, flaky_s = timed(
+                lambda: fetcher.fetch_pages(server.url + "/posts", limit=PAGE_SIZE)
+            )
+        assert flaky.equals(after)
+        flaky_requests = server.requests
+
+    pages = N_POSTS // PAGE_SIZE + 1
+    print(f"{pages} pages of {PAGE_SIZE} posts, {LATENCY * 1000:.0f} ms per response")
+    print(
+        f"sequential requests.get : {before_s:6.2f}s {N_POSTS / before_s:9,.0f} rows/s"
+    )
+    print(f"Fetcher (8 workers)     : {after_s:6.2f}s {N_POSTS / after_s:9,.0f} rows/s")
+    print(f"speed-up                : {before_s / after_s:6.1f}x")
+    print(
+        f"with every 7th request failing: {flaky_s:.2f}s, "
+        f"{flaky_requests} requests including retries"
+    )
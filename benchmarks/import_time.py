@@ -0,0 +1,75 @@
+"""
+Cold-start report for the CLI and web entry points.
+
+For each entry module it runs `python -X importtime -c "import <module>"`
+in a fresh interpreter and sums the self time per top-level package, so
+the heaviest imports stand out. It then times a few cold-start paths end
+to end (fresh process until the first result), taking the median of
+several runs. scikit-learn should not appear for the web and screener
+entry points: it is only imported once a model is built or unpickled.
+
+Run from the repository root:
+    python3 -m benchmarks.import_time
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+MODULES = ["stock_forcast", "stock_forcast_by_flask", "screener"]
+COLD_PATHS = {
+    "screener --help": ["screener.py", "--help"],
+    "dashboard GET /": [
+        "-c",
+        "from stock_forcast_by_flask import app; app.test_client().get('/')",
+    ],
+    "GET /healthz": [
+        "-c",
+        "from stock_forcast_by_flask import app; app.test_client().get('/healthz')",
+    ],
+}
+RUNS = 5
+TOP = 8
+
+
+def import_times(module):
+    """{top-level package: self microseconds} for importing `module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return packages
+
+
+def cold_start(args, runs=RUNS):
+    """Median wall time (seconds) of `python <args>` in a fresh process"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    for module in MODULES:
+        packages = import_times(module)
+        total = sum(packages.values())
+        print(f"import {module}: {total / 1000:.0f} ms")
+        for package, us in packages.most_common(TOP):
+            print(f"    {package:28} {us / 1000:8.1f} ms {us / total:6.1%}")
+        print(f"    sklearn imported: {'sklearn' in packages}")
+
+    print(f"\n{'cold start':24} {'median s':>9}")
+    for name, args in COLD_PATHS.items():
+        print(f"{name:24} {cold_start(args):9.3f}")
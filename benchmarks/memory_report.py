@@ -0,0 +1,40 @@
+"""
+Memory per symbol: default float64 frames vs the compact representation.
+
+Runs the indicator pipeline on the bundled CSV data both ways and reports
+the bytes held by the resulting DataFrame (values and index).
+
+Run from the repository root:
+    python3 -m benchmarks.memory_report
+"""
+
+from price_store import CsvProvider, compact_prices
+from stock_forcast import calculate_MACD, calculate_moving_averages, calculate_RSI
+
+SYMBOLS = ["TATAMOTORS.NS", "OLAELEC.NS"]
+
+
+def frame_bytes(data):
+    return int(data.memory_usage(deep=True, index=True).sum())
+
+
+def pipeline(data, compact):
+    data = calculate_moving_averages(data)
+    data = calculate_RSI(data)
+    return calculate_MACD(data, keep_emas=not compact)
+
+
+if __name__ == "__main__":
+    provider = CsvProvider(".")
+    print(f"{'Symbol':15} {'rows':>6} {'float64':>12} {'compact':>12} {'saved':>7}")
+    for symbol in SYMBOLS:
+        raw = provider.history(symbol)
+        before = frame_bytes(pipeline(raw.copy(), compact=False))
+        after = frame_bytes(pipeline(compact_prices(raw), compact=True))
+        print(
+            f"{symbol:15} {len(raw):6} {before:10,} B {after:10,} B "
+            f"{1 - after / before:6.0%}"
+        )
+        print(
+            f"{'':15} {'':6} {before / len(raw):8.0f} B/row {after / len(raw):6.0f} B/row"
+        )
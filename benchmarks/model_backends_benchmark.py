@@ -0,0 +1,69 @@
+"""
+Compare the model backends on the bundled CSV data.
+
+For every backend and symbol it reports the fit time, the median latency
+of a single-row prediction, the pickled model size and the test MAE of
+the next-day (recursive) model.
+
+Run from the repository root:
+    python3 -m benchmarks.model_backends_benchmark
+"""
+
+import pickle
+import statistics
+import time
+
+from sklearn.metrics import mean_absolute_error
+
+from features import build_feature_matrix
+from model_backends import BACKENDS, get_backend, make_model
+from price_store import CsvProvider
+from stock_forcast import calculate_MACD, calculate_moving_averages, calculate_RSI
+
+SYMBOLS = ["TATAMOTORS.NS", "OLAELEC.NS"]
+PREDICT_REPEATS = 50
+
+
+def prepare(provider, symbol):
+    data = provider.history(symbol)
+    data = calculate_moving_averages(data)
+    data = calculate_RSI(data)
+    return calculate_MACD(data)
+
+
+def measure(backend, data):
+    fm = build_feature_matrix(data, features=get_backend(backend)["features"])
+    model = make_model(backend)
+
+    start = time.perf_counter()
+    model.fit(fm.X_train, fm.y_train)
+    fit_seconds = time.perf_counter() - start
+
+    timings = []
+    for _ in range(PREDICT_REPEATS):
+        start = time.perf_counter()
+        model.predict(fm.last_row)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "fit_ms": fit_seconds * 1000,
+        "predict_ms": statistics.median(timings) * 1000,
+        "size": len(pickle.dumps(model)),
+        "mae": mean_absolute_error(fm.y_test, model.predict(fm.X_test)),
+    }
+
+
+if __name__ == "__main__":
+    provider = CsvProvider(".")
+    print(
+        f"{'Symbol':15} {'backend':14} {'fit ms':>9} {'predict ms':>11} "
+        f"{'model size':>12} {'MAE':>9}"
+    )
+    for symbol in SYMBOLS:
+        data = prepare(provider, symbol)
+        for backend in BACKENDS:
+            r = measure(backend, data)
+            print(
+                f"{symbol:15} {backend:14} {r['fit_ms']:9.1f} {r['predict_ms']:11.3f} "
+                f"{r['size']:10,} B {r['mae']:9.2f}"
+            )
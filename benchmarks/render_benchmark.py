@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: per-request render time of the dashboard page.
+
+"before" re-parses the template source with render_template_string and
+re-renders the table with to_html on every request (the old index()).
+"after" uses the compiled template from Flask's cached Jinja environment
+and the per-(symbol, bar date) table cache.
+
+Run from the repository root:
+    python3 -m benchmarks.render_benchmark
+"""
+
+import os
+import time
+
+from flask import render_template, render_template_string
+
+from price_store import CsvProvider
+from stock_forcast import calculate_MACD, calculate_moving_averages, calculate_RSI
+from stock_forcast_by_flask import BACKENDS, STOCKS, app, render_table
+
+SYMBOL = "TATAMOTORS.NS"
+ROUNDS = 200
+
+
+def time_per_call(fn, rounds=ROUNDS):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+if __name__ == "__main__":
+    data = CsvProvider(".").history(SYMBOL)
+    data = calculate_MACD(calculate_RSI(calculate_moving_averages(data)))
+    result = {
+        "symbol": SYMBOL,
+        "trend": "SIDEWAYS (uncertain)",
+        "current_price": f"{data['Close'].iloc[-1]:.2f}",
+        "predicted_price": "0.00",
+        "price_difference": "0.00",
+        "profit_or_loss": "0.00%",
+        "entry_price": "No Entry Signal",
+        "stop_loss": "-",
+        "date_now": data.index[-1].date(),
+        "future_date": data.index[-1].date(),
+        "model_source": "cached",
+        "backend": "random_forest",
+    }
+    with open(os.path.join(app.root_path, "templates", "index.html")) as f:
+        source = f.read()
+
+    def before():
+        table_html = (
+            data.tail(30)
+            .reset_index()
+            .to_html(classes="table table-striped table-bordered", index=False)
+        )
+        return render_template_string(
+            source,
+            stocks=STOCKS,
+            backends=BACKENDS,
+            result=result,
+            table_html=table_html,
+        )
+
+    def after():
+        table_html = render_table(SYMBOL, data)
+        return render_template(
+            "index.html",
+            stocks=STOCKS,
+            backends=BACKENDS,
+            result=result,
+            table_html=table_html,
+        )
+
+    with app.test_request_context():
+        assert before() == after()
+        before_ms = time_per_call(before)
+        after_ms = time_per_call(after)
+
+    print(f"render_template_string + to_html : {before_ms:8.3f} ms/request")
+    print(f"cached template + cached table   : {after_ms:8.3f} ms/request")
+    print(f"speed-up                         : {before_ms / after_ms:8.1f}x")
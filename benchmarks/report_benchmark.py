@@ -0,0 +1,74 @@
+"""
+Report export: one-shot to_html / to_csv vs the streaming report writer.
+
+"before" builds the whole page as one string with to_html (as
+generate_html_report used to) and writes the CSV with one to_csv call from
+a concatenated frame; "after" streams both through report_writer from
+per-symbol frames. Peak memory is what tracemalloc sees while writing, so
+it does not include the input frames.
+
+Run from the repository root:
+    python3 -m benchmarks.report_benchmark
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from backtest import synthetic_panel
+from report_writer import write_csv, write_html_report
+
+SIZES = [10_000, 100_000]
+SYMBOLS = 10
+
+
+def symbol_frames(n_rows):
+    """SYMBOLS frames of daily closes, n_rows in total"""
+    per_symbol = n_rows // SYMBOLS
+    close = synthetic_panel(SYMBOLS, n_dates=per_symbol)
+    index = pd.date_range("1990-01-01", periods=per_symbol, freq="D", name="Date")
+    return [
+        pd.DataFrame(
+            {"Symbol": f"SYN{i}", "Close": close[:, i], "Volume": 1_000}, index=index
+        )
+        for i in range(SYMBOLS)
+    ]
+
+
+def before(frames, folder):
+    data = pd.concat(frames)
+    table_html = data.reset_index().to_html(
+        classes="table table-striped table-bordered", index=False
+    )
+    page = f"<html><body><div class='container'>{table_html}</div></body></html>"
+    with open(os.path.join(folder, "before.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+    data.to_csv(os.path.join(folder, "before.csv"))
+
+
+def after(frames, folder):
+    write_html_report(os.path.join(folder, "after.html"), frames, page_size=100)
+    write_csv(os.path.join(folder, "after.csv"), frames)
+
+
+def measure(fn, frames, folder):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fn(frames, folder)
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>8} {'writer':10} {'seconds':>8} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as folder:
+        for n_rows in SIZES:
+            frames = symbol_frames(n_rows)
+            for name, fn in [("to_html", before), ("streaming", after)]:
+                seconds, peak = measure(fn, frames, folder)
+                print(f"{n_rows:8} {name:10} {seconds:8.2f} {peak / 2**20:9.1f}")
@@ -0,0 +1,90 @@
+"""
+Timeframe resampling: cost of building the bars (cold and cached) and of
+running the indicators and the trend on them instead of the base bars.
+
+Datasets are the TATAMOTORS daily CSV (daily -> weekly / monthly) and
+synthetic one-minute bars for a year of trading days (minute -> daily /
+weekly / monthly).
+
+Run from the repository root:
+    python3 -m benchmarks.resample_benchmark
+"""
+
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import synthetic_panel
+from price_store import CsvProvider
+from stock_forcast import (
+    calculate_MACD,
+    calculate_moving_averages,
+    calculate_RSI,
+    determin_trend,
+)
+from timeframes import BarCache, resample_bars
+
+RUNS = 5
+MINUTES_PER_DAY = 375  # 09:15 - 15:30 IST
+TRADING_DAYS = 250
+
+
+def median_ms(fn, runs=RUNS):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def minute_bars(days=TRADING_DAYS):
+    close = synthetic_panel(1, n_dates=days * MINUTES_PER_DAY)[:, 0]
+    dates = pd.bdate_range("2024-01-01", periods=days, tz="Asia/Kolkata")
+    index = dates.repeat(MINUTES_PER_DAY) + pd.to_timedelta(
+        np.tile(np.arange(MINUTES_PER_DAY) + 555, days), unit="min"
+    )
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close,
+            "Low": close,
+            "Close": close,
+            "Volume": np.int64(1_000),
+        },
+        index=index.rename("Date"),
+    )
+
+
+def indicators_and_trend(data):
+    data = calculate_MACD(calculate_RSI(calculate_moving_averages(data.copy())))
+    return determin_trend(data)
+
+
+def bench(name, data, timeframes):
+    base_ms = median_ms(lambda: indicators_and_trend(data))
+    print(f"{name:22} {'base':6} {len(data):9} {'':>9} {'':>9} {base_ms:11.2f}")
+    for timeframe in timeframes:
+        cache = BarCache()
+        cold_ms = median_ms(lambda: resample_bars(data, timeframe))
+        cache.resample(data, timeframe)
+        cached_ms = median_ms(lambda: cache.resample(data, timeframe))
+        bars = resample_bars(data, timeframe)
+        run_ms = median_ms(lambda: indicators_and_trend(bars))
+        print(
+            f"{name:22} {timeframe:6} {len(bars):9} {cold_ms:9.2f} "
+            f"{cached_ms:9.2f} {run_ms:11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    print(
+        f"{'data':22} {'bars':6} {'rows':>9} {'cold ms':>9} {'cached ms':>9} "
+        f"{'trend ms':>11}"
+    )
+    bench(
+        "TATAMOTORS.NS daily", CsvProvider(".").history("TATAMOTORS.NS"), ["1wk", "1mo"]
+    )
+    bench(f"{TRADING_DAYS} days of minutes", minute_bars(), ["1d", "1wk", "1mo"])
@@ -0,0 +1,107 @@
+"""
+RSI: the pandas implementation calculate_RSI used to have vs rsi_kernel.
+
+For each bundled CSV, a synthetic 1M-bar series and a 500-symbol panel, the
+pandas version (per symbol for the panel) is timed against the kernel with
+both smoothing methods and every available engine (Numba only when it is
+installed). "max diff" is the largest difference from pandas for the SMA
+method; Wilder has no pandas counterpart here.
+
+Run from the repository root:
+    python3 -m benchmarks.rsi_benchmark
+"""
+
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backtest import synthetic_panel
+from frame_export import import_frame
+from rsi_kernel import METHODS, _get_numba_kernel, rsi_kernel
+
+CSV_FILES = [
+    "TATAMOTORS.NS_stock_data.csv",
+    "OLAELEC.NS_stock_data.csv",
+    "stock_data.csv",
+]
+SERIES_BARS = 1_000_000
+PANEL_SYMBOLS = 500
+RUNS = 5
+
+
+def pandas_rsi(close, window=14):
+    """The former calculate_RSI body"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.rolling(window=window).mean()
+    avg_loss = loss.rolling(window=window).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def pandas_panel(close):
+    return np.column_stack(
+        [pandas_rsi(pd.Series(close[:, i])).to_numpy() for i in range(close.shape[1])]
+    )
+
+
+def measure(fn, runs=RUNS):
+    """(median ms, tracemalloc peak MB, result)"""
+    result = fn()  # warm-up (and Numba compilation)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times) * 1000, peak / 2**20, result
+
+
+def bench(name, close, reference):
+    engines = ["numpy"] + (["numba"] if _get_numba_kernel() is not None else [])
+    base_ms, base_mb, expected = measure(reference)
+    print(f"{name:32} {'pandas':14} {base_ms:10.2f} {base_mb:9.2f} {'':>8}")
+    for engine in engines:
+        for method in METHODS:
+            ms, mb, got = measure(
+                lambda: rsi_kernel(close, method=method, engine=engine)
+            )
+            diff = ""
+            if method == "sma":
+                diff = f"{np.nanmax(np.abs(got - expected)):.1e}"
+            label = f"{engine} {method}"
+            print(
+                f"{name:32} {label:14} {ms:10.2f} {mb:9.2f} {diff:>8} "
+                f"({base_ms / ms:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    if _get_numba_kernel() is None:
+        print("numba not installed; timing the NumPy engine only\n")
+    print(f"{'data':32} {'rsi':14} {'ms':>10} {'peak MB':>9} {'max diff':>8}")
+    for csv_path in CSV_FILES:
+        close = import_frame(csv_path)["Close"]
+        bench(csv_path, close.to_numpy(), lambda: pandas_rsi(close).to_numpy())
+
+    series = pd.Series(synthetic_panel(1, n_dates=SERIES_BARS)[:, 0])
+    bench(
+        f"synthetic {SERIES_BARS:,} bars",
+        series.to_numpy(),
+        lambda: pandas_rsi(series).to_numpy(),
+    )
+    panel = synthetic_panel(PANEL_SYMBOLS)
+    bench(
+        f"panel {PANEL_SYMBOLS}x{len(panel)}",
+        panel,
+        lambda: pandas_panel(panel),
+    )
@@ -0,0 +1,319 @@
+"""
+Offline benchmark suite for the forecast pipeline.
+
+Times every stage (moving averages, RSI, MACD, forecast, dashboard HTML
+rendering) on the checked-in CSV files and on synthetic random-walk
+series: single series of 10k, 100k and 1M one-minute bars, and a panel of
+many symbols with five years of daily bars each. For every dataset and
+stage it reports p50/p95 latency, throughput in bars per second and the
+peak memory allocated during one run (measured in a separate run with
+tracemalloc, so it does not slow the timed rounds).
+
+Results can be saved as a baseline and later compared against; stages whose
+p50 latency or peak memory grew by more than --threshold are flagged and the
+run exits with status 1.
+
+Run from the repository root:
+    python3 -m benchmarks.suite
+    python3 -m benchmarks.suite --quick --save benchmarks/baselines/quick.json \\
+        --note "1-CPU Linux x86_64 VM (Intel Xeon)"
+    python3 -m benchmarks.suite --quick --compare benchmarks/baselines/quick.json
+
+benchmarks/baselines/quick.json was recorded on a 1-CPU Linux x86_64 VM
+(Intel Xeon, Python 3.11, numpy 2.4, pandas 3.0); its "meta" block lists
+the versions. Compare only against a baseline saved on the same machine,
+or save a new one there first.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from flask import render_template
+
+from backtest import synthetic_panel
+from model_backends import BACKENDS, DEFAULT_BACKEND
+from price_store import COLUMNS
+from stock_forcast import (
+    calculate_MACD,
+    calculate_moving_averages,
+    calculate_RSI,
+    model_forecast,
+)
+from stock_forcast_by_flask import STOCKS, app
+
+CSV_FILES = [
+    "TATAMOTORS.NS_stock_data.csv",
+    "OLAELEC.NS_stock_data.csv",
+    "stock_data.csv",
+]
+SERIES_SIZES = [10_000, 100_000, 1_000_000]
+PANEL_SYMBOLS = 100
+STAGES = ["moving_averages", "rsi", "macd", "forecast", "render"]
+# Forecasting trains a model per round; skip datasets bigger than this
+FORECAST_MAX_BARS = 5_000
+# Ignore latency changes smaller than this when comparing to a baseline
+MIN_DELTA_MS = 0.5
+
+
+# =============== Datasets ===============
+def load_csv(path, tz="Asia/Kolkata"):
+    data = pd.read_csv(path, index_col="Date")
+    data.index = pd.to_datetime(data.index, utc=True).tz_convert(tz)
+    data.index.name = "Date"
+    return data[[c for c in COLUMNS if c in data.columns]]
+
+
+def synthetic_frame(close, seed=0):
+    """OHLCV one-minute bars around a random-walk close series"""
+    rng = np.random.default_rng(seed)
+    open_ = np.concatenate([close[:1], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, len(close))) * close
+    index = pd.date_range("2000-01-03 09:15", periods=len(close), freq="min")
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, len(close)),
+        },
+        index=index.tz_localize("Asia/Kolkata").rename("Date"),
+    )
+
+
+def build_datasets(sizes=SERIES_SIZES, panel_symbols=PANEL_SYMBOLS):
+    """name -> list of per-symbol frames"""
+    datasets = {}
+    for path in CSV_FILES:
+        if os.path.exists(path):
+            datasets[os.path.basename(path)] = [load_csv(path)]
+    for n in sizes:
+        datasets[f"synthetic_{n}"] = [synthetic_frame(synthetic_panel(1, n)[:, 0])]
+    if panel_symbols:
+        panel = synthetic_panel(panel_symbols)
+        datasets[f"panel_{panel_symbols}x{len(panel)}"] = [
+            synthetic_frame(panel[:, i], seed=i) for i in range(panel_symbols)
+        ]
+    return datasets
+
+
+# =============== Stages ===============
+def render_dashboard(data, symbol):
+    """The dashboard page as index() renders it, without the table cache"""
+    table_html = (
+        data.tail(30)
+        .reset_index()
+        .to_html(classes="table table-striped table-bordered", index=False)
+    )
+    result = {
+        "symbol": symbol,
+        "trend": "SIDEWAYS (uncertain)",
+        "current_price": f"{data['Close'].iloc[-1]:.2f}",
+        "predicted_price": "0.00",
+        "price_difference": "0.00",
+        "profit_or_loss": "0.00%",
+        "entry_price": "No Entry Signal",
+        "stop_loss": "-",
+        "date_now": data.index[-1].date(),
+        "future_date": data.index[-1].date(),
+        "model_source": "trained",
+        "backend": DEFAULT_BACKEND,
+    }
+    return render_template(
+        "index.html",
+        stocks=STOCKS,
+        backends=BACKENDS,
+        result=result,
+        table_html=table_html,
+    )
+
+
+def stage_fn(name, frames, backend):
+    """Zero-argument callable running stage `name` over every frame"""
+    if name == "moving_averages":
+        return lambda: [calculate_moving_averages(data) for data in frames]
+    if name == "rsi":
+        return lambda: [calculate_RSI(data) for data in frames]
+    if name == "macd":
+        return lambda: [calculate_MACD(data) for data in frames]
+    if name == "forecast":
+
+        def forecast():
+            # train_model prints the test MAE on every fit
+            with redirect_stdout(io.StringIO()):
+                return [model_forecast(data, backend=backend) for data in frames]
+
+        return forecast
+    if name == "render":
+        return lambda: [render_dashboard(data, "BENCH") for data in frames]
+    raise ValueError(f"Unknown stage: {name}")
+
+
+# =============== Measurement ===============
+def measure(fn, rounds, budget):
+    """Latencies (seconds) of up to `rounds` calls within `budget` seconds"""
+    fn()  # warm up
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < rounds and (len(times) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(fn):
+    """Peak bytes allocated while running `fn` once"""
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        fn()
+        return max(0, tracemalloc.get_traced_memory()[1] - start)
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(
+    datasets,
+    stages=STAGES,
+    backend=DEFAULT_BACKEND,
+    rounds=20,
+    budget=3.0,
+    forecast_max_bars=FORECAST_MAX_BARS,
+):
+    """Benchmark every stage on every dataset; returns {"dataset/stage": stats}"""
+    results = {}
+    with app.test_request_context():
+        for name, frames in datasets.items():
+            bars = sum(len(data) for data in frames)
+            # Later stages need the indicator columns of the earlier ones
+            for data in frames:
+                calculate_MACD(calculate_RSI(calculate_moving_averages(data)))
+            for stage_name in stages:
+                if stage_name == "forecast" and bars > forecast_max_bars:
+                    continue
+                fn = stage_fn(stage_name, frames, backend)
+                times = measure(fn, rounds, budget)
+                p50, p95 = np.percentile(times, [50, 95])
+                stats = {
+                    "bars": bars,
+                    "rounds": len(times),
+                    "p50_ms": p50 * 1000,
+                    "p95_ms": p95 * 1000,
+                    "bars_per_sec": bars / p50,
+                    "peak_bytes": peak_memory(fn),
+                }
+                results[f"{name}/{stage_name}"] = stats
+                print(format_row(f"{name}/{stage_name}", stats), flush=True)
+    return results
+
+
+# =============== Baselines ===============
+def save_baseline(path, results, note=None):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+    if note:
+        meta["note"] = note
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, threshold):
+    """Print each stage against the baseline; returns the regressed keys"""
+    regressions = []
+    print(f"\n{'dataset/stage':40} {'p50 ms':>10} {'baseline':>10} {'change':>8}")
+    for key, stats in results.items():
+        old = baseline.get(key)
+        if old is None:
+            print(f"{key:40} {stats['p50_ms']:10.2f} {'-':>10} {'new':>8}")
+            continue
+        change = stats["p50_ms"] / old["p50_ms"] - 1
+        slower = change > threshold and stats["p50_ms"] - old["p50_ms"] > MIN_DELTA_MS
+        bigger = stats["peak_bytes"] > old["peak_bytes"] * (1 + threshold)
+        flags = []
+        if slower:
+            flags.append("SLOWER")
+        if bigger:
+            flags.append(f"MEMORY {old['peak_bytes']:,} -> {stats['peak_bytes']:,} B")
+        if flags:
+            regressions.append(key)
+        print(
+            f"{key:40} {stats['p50_ms']:10.2f} {old['p50_ms']:10.2f} "
+            f"{change:+7.0%} {' '.join(flags)}"
+        )
+    return regressions
+
+
+def format_row(key, stats):
+    return (
+        f"{key:40} {stats['bars']:9} {stats['rounds']:6} {stats['p50_ms']:10.2f} "
+        f"{stats['p95_ms']:10.2f} {stats['bars_per_sec']:14,.0f} "
+        f"{stats['peak_bytes'] / 2**20:9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the forecast pipeline")
+    parser.add_argument("--quick", action="store_true", help="10k bars, 20 symbols")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=3.0, help="seconds per stage")
+    parser.add_argument("--forecast-max-bars", type=int, default=FORECAST_MAX_BARS)
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--note", help="describe the machine in the baseline")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.quick:
+        datasets = build_datasets(sizes=[10_000], panel_symbols=20)
+    else:
+        datasets = build_datasets()
+
+    print(
+        f"{'dataset/stage':40} {'bars':>9} {'rounds':>6} {'p50 ms':>10} "
+        f"{'p95 ms':>10} {'bars/sec':>14} {'peak MB':>9}"
+    )
+    results = run_suite(
+        datasets,
+        stages=args.stages,
+        backend=args.backend,
+        rounds=args.rounds,
+        budget=args.budget,
+        forecast_max_bars=args.forecast_max_bars,
+    )
+
+    if args.save:
+        save_baseline(args.save, results, args.note)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Copy-free feature matrix builder for the forecast models.
+
+The feature matrix is assembled once into a single C-contiguous array and
+the targets are gathered straight from the Close column; train, test and
+last-row inputs are views into those arrays, so no DataFrame copies are
+made between the indicator frame and the model.
+"""
+
+import math
+
+import numpy as np
+
+from instrumentation import stage
+
+FEATURES = ["Close", "50MA", "200MA", "RSI", "MACD", "MACD_signal"]
+# Indicator features plus the previous five closes ("<column>_lag<k>")
+LAG_FEATURES = FEATURES + [f"Close_lag{k}" for k in range(1, 6)]
+
+
+def parse_feature(name):
+    """Split "Close_lag3" into ("Close", 3); plain column names have lag 0"""
+    column, sep, lag = name.rpartition("_lag")
+    if sep and lag.isdigit():
+        return column, int(lag)
+    return name, 0
+
+
+def feature_column(data, name):
+    """Values of feature `name`; lagged features are shifted down, NaN-padded"""
+    column, lag = parse_feature(name)
+    values = data[column].to_numpy()
+    if lag == 0:
+        return values
+    shifted = np.full(len(values), np.nan, dtype=np.result_type(values, np.float32))
+    shifted[lag:] = values[:-lag]
+    return shifted
+
+
+def split_point(n_rows, test_size=0.2):
+    """Rows used for training; same split as train_test_split(shuffle=False)"""
+    return n_rows - math.ceil(n_rows * test_size)
+
+
+class FeatureMatrix:
+    """
+    X: (rows, features) array of every bar with complete features
+    y: targets for the first `n_rows` rows of X (bars that have a future close)
+    """
+
+    def __init__(self, X, y, index, n_train):
+        self.X = X
+        self.y = y
+        self.index = index
+        self.n_train = n_train
+
+    @property
+    def n_rows(self):
+        return len(self.y)
+
+    @property
+    def X_train(self):
+        return self.X[: self.n_train]
+
+    @property
+    def y_train(self):
+        return self.y[: self.n_train]
+
+    @property
+    def X_test(self):
+        return self.X[self.n_train : self.n_rows]
+
+    @property
+    def y_test(self):
+        return self.y[self.n_train : self.n_rows]
+
+    @property
+    def X_labeled(self):
+        return self.X[: self.n_rows]
+
+    @property
+    def last_row(self):
+        return self.X[-1:]
+
+
+def build_feature_matrix(
+    data, days_ahead=1, method="recursive", features=FEATURES, test_size=0.2
+):
+    """
+    Build the feature matrix and targets for `data`.
+    method="recursive": y is the next close (1-D).
+    method="direct": y[:, k] is the close k+1 bars ahead, k < days_ahead.
+    """
+    with stage("features.mask"):
+        columns = [feature_column(data, name) for name in features]
+        valid = np.ones(len(data), dtype=bool)
+        for column in columns:
+            valid &= ~np.isnan(column)
+        rows = np.flatnonzero(valid)
+
+    with stage("features.X"):
+        X = np.empty((len(rows), len(features)), dtype=np.result_type(*columns))
+        for j, column in enumerate(columns):
+            np.take(column, rows, out=X[:, j])
+
+    with stage("features.y"):
+        close = data["Close"].to_numpy()
+        horizon = days_ahead if method == "direct" else 1
+        if method not in ("direct", "recursive"):
+            raise ValueError(f"Unknown forecast method: {method}")
+        # Feature rows whose future closes are all known
+        labeled = rows[rows + horizon < len(close)]
+        if method == "direct":
+            y = close[labeled[:, None] + np.arange(1, horizon + 1)]
+        else:
+            y = close[labeled + 1]
+
+    return FeatureMatrix(X, y, data.index[rows], split_point(len(y), test_size))
@@ -0,0 +1,207 @@
+"""
+Binary export / import of price and indicator frames.
+
+Formats (picked from the file extension):
+
+    .csv      text, as written by the existing dumps
+    .parquet  Parquet (needs pyarrow or fastparquet)
+    .feather  Arrow IPC, memory-mappable (needs pyarrow)
+    .cols     folder of one .npy file per column plus meta.json; the index
+              is stored as int64 epoch nanoseconds (UTC) and every column
+              can be memory-mapped with numpy. Missing values of string
+              columns are stored as "" plus a boolean mask file
+
+import_csv() reads an existing CSV dump once, writes a binary copy next to
+it and serves that copy afterwards (until the CSV is newer).
+
+Usage:
+    python3 frame_export.py TATAMOTORS.NS_stock_data.csv --format cols
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".cols": "cols",
+}
+DEFAULT_TZ = "Asia/Kolkata"
+
+
+def format_of(path, fmt=None):
+    if fmt is not None:
+        return fmt
+    ext = os.path.splitext(path.rstrip("/\\"))[1]
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Unknown export format for {path}")
+    return EXTENSIONS[ext]
+
+
+def available_formats():
+    """Formats whose optional dependencies are installed"""
+    formats = ["csv", "cols"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats += ["parquet", "feather"]
+    elif importlib.util.find_spec("fastparquet") is not None:
+        formats.append("parquet")
+    return formats
+
+
+def _require(fmt):
+    if fmt not in available_formats():
+        raise ImportError(f"{fmt} export needs pyarrow (pip install pyarrow)")
+
+
+# =============== Column folders ===============
+def _write_cols(data, path):
+    os.makedirs(path, exist_ok=True)
+    index = data.index
+    meta = {"index": index.name or "index", "columns": [], "tz": None, "missing": []}
+    if isinstance(index, pd.DatetimeIndex):
+        meta["tz"] = str(index.tz) if index.tz is not None else None
+        utc = index.tz_convert("UTC") if index.tz is not None else index
+        np.save(os.path.join(path, "__index__.npy"), utc.as_unit("ns").asi8)
+        meta["index_kind"] = "datetime"
+    else:
+        np.save(os.path.join(path, "__index__.npy"), index.to_numpy())
+        meta["index_kind"] = "plain"
+    for i, column in enumerate(data.columns):
+        values = data[column].to_numpy()
+        if values.dtype.kind == "O":
+            missing = pd.isna(values)
+            if missing.any():
+                # astype(str) would turn None / NaN into the string "nan"
+                np.save(os.path.join(path, f"{i}.missing.npy"), missing)
+                meta["missing"].append(str(column))
+                values = np.where(missing, "", values)
+            # Fixed-width unicode keeps string columns memory-mappable
+            values = values.astype(str)
+        np.save(os.path.join(path, f"{i}.npy"), values)
+        meta["columns"].append(str(column))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _read_meta(path):
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_columns(path, mmap=True):
+    """
+    (index, {column: array}) of a .cols folder. With mmap=True the arrays
+    are read-only memory maps of the files, so nothing is read up front.
+    Missing strings read as "" here; see missing_masks().
+    """
+    meta = _read_meta(path)
+    mode = "r" if mmap else None
+    raw_index = np.load(os.path.join(path, "__index__.npy"), mmap_mode=mode)
+    if meta["index_kind"] == "datetime":
+        index = pd.DatetimeIndex(np.asarray(raw_index).view("datetime64[ns]"))
+        if meta["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    else:
+        index = pd.Index(raw_index)
+    index.name = meta["index"]
+    columns = {
+        name: np.load(os.path.join(path, f"{i}.npy"), mmap_mode=mode)
+        for i, name in enumerate(meta["columns"])
+    }
+    return index, columns
+
+
+def missing_masks(path):
+    """{column: bool array} for the string columns that have missing values"""
+    meta = _read_meta(path)
+    return {
+        name: np.load(os.path.join(path, f"{i}.missing.npy"))
+        for i, name in enumerate(meta["columns"])
+        if name in meta.get("missing", [])
+    }
+
+
+def _read_cols(path):
+    index, columns = read_columns(path, mmap=False)
+    missing = missing_masks(path)
+    data = pd.DataFrame(columns, index=index)
+    for name, values in columns.items():
+        if values.dtype.kind == "U":
+            values = values.astype(object)
+            if name in missing:
+                values[missing[name]] = None
+            data[name] = values
+    return data
+
+
+# =============== Export / import ===============
+def export_frame(data, path, fmt=None):
+    """Write `data` (index included) in the format of `path`"""
+    fmt = format_of(path, fmt)
+    if fmt == "csv":
+        data.to_csv(path)
+    elif fmt == "cols":
+        _write_cols(data, path)
+    else:
+        _require(fmt)
+        if fmt == "parquet":
+            data.to_parquet(path)
+        else:
+            data.reset_index().to_feather(path)
+    return path
+
+
+def import_frame(path, fmt=None, tz=DEFAULT_TZ):
+    """Read a frame written by export_frame() (or an existing CSV dump)"""
+    fmt = format_of(path, fmt)
+    if fmt == "csv":
+        data = pd.read_csv(path, index_col=0)
+        if data.index.name == "Date":
+            data.index = pd.to_datetime(data.index, utc=True).tz_convert(tz)
+        return data
+    if fmt == "cols":
+        return _read_cols(path)
+    _require(fmt)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    data = pd.read_feather(path)
+    return data.set_index(data.columns[0])
+
+
+def binary_path(csv_path, fmt="cols"):
+    return os.path.splitext(csv_path)[0] + "." + fmt
+
+
+def import_csv(csv_path, fmt="cols", tz=DEFAULT_TZ):
+    """
+    Read a CSV dump through a binary copy: the CSV is parsed (and converted)
+    only when the copy is missing or older than the CSV.
+    """
+    path = binary_path(csv_path, fmt)
+    # meta.json is written last, so it also marks a complete .cols folder
+    stamp = os.path.join(path, "meta.json") if fmt == "cols" else path
+    if os.path.exists(stamp) and os.path.getmtime(stamp) >= os.path.getmtime(csv_path):
+        return import_frame(path, fmt)
+    data = import_frame(csv_path, "csv", tz=tz)
+    export_frame(data, path, fmt)
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert CSV dumps to binary")
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument(
+        "--format", default="cols", choices=["cols", "parquet", "feather"]
+    )
+    parser.add_argument("--tz", default=DEFAULT_TZ)
+    args = parser.parse_args()
+    for csv_path in args.csv:
+        data = import_frame(csv_path, "csv", tz=args.tz)
+        path = export_frame(data, binary_path(csv_path, args.format), args.format)
+        print(f"{csv_path} -> {path} ({len(data)} rows)")
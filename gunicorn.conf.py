@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for wsgi.py:
+
+    gunicorn -c gunicorn.conf.py
+"""
+
+import os
+
+# Build the app with the factory (importing wsgi alone does not warm up)
+wsgi_app = "wsgi:create_app()"
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_WORKERS", str(os.cpu_count() or 1)))
+threads = int(os.environ.get("WEB_THREADS", "4"))
+# Import and warm up the app once in the master, then fork the workers
+preload_app = True
+# Training a forest for an uncached symbol can take a while
+timeout = int(os.environ.get("WEB_TIMEOUT", "120"))
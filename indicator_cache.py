@@ -0,0 +1,155 @@
+"""
+Memoization of the indicator functions.
+
+Results are keyed by the function, its keyword arguments and a cheap
+fingerprint of the input: symbol, first / last timestamp, row count, Close
+dtype and a hash of the last TAIL_ROWS closes. A repeated request for the
+same series is served from the cache; a new or changed bar at the end
+changes the fingerprint and triggers a recomputation.
+
+Only the columns an indicator adds are cached (as numpy arrays). Memory is
+bounded by `max_bytes` / `max_entries` with LRU eviction; with `spill_dir`
+set, evicted results are written there and read back on a later miss.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+TAIL_ROWS = 64
+DEFAULT_MAX_BYTES = int(os.environ.get("INDICATOR_CACHE_MAX_BYTES", str(64 * 1024**2)))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("INDICATOR_CACHE_MAX_ENTRIES", "1024"))
+DEFAULT_SPILL_DIR = os.environ.get("INDICATOR_CACHE_DIR") or None
+
+
+def fingerprint(data, symbol=None, tail_rows=TAIL_ROWS):
+    close = data["Close"].to_numpy()
+    tail = np.ascontiguousarray(close[-tail_rows:])
+    return (
+        symbol,
+        data.index[0].isoformat() if len(data) else None,
+        data.index[-1].isoformat() if len(data) else None,
+        len(data),
+        close.dtype.str,
+        hashlib.sha1(tail.tobytes()).hexdigest(),
+    )
+
+
+class IndicatorCache:
+    def __init__(
+        self,
+        max_bytes=DEFAULT_MAX_BYTES,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        spill_dir=DEFAULT_SPILL_DIR,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()  # key -> {column: array}, oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.spills = 0
+
+    # =============== Storage ===============
+    def _spill_path(self, key):
+        name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, name + ".npz")
+
+    def _store(self, key, columns):
+        # Two concurrent misses may store the same key; count it once
+        replaced = self._entries.pop(key, None)
+        if replaced is not None:
+            self._bytes -= sum(values.nbytes for values in replaced.values())
+        self._entries[key] = columns
+        self._entries.move_to_end(key)
+        self._bytes += sum(values.nbytes for values in columns.values())
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            old_key, old = self._entries.popitem(last=False)
+            self._bytes -= sum(values.nbytes for values in old.values())
+            if self.spill_dir is not None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                # Column names may contain spaces; store them positionally
+                np.savez(
+                    self._spill_path(old_key),
+                    names=np.array(list(old)),
+                    **{f"c{i}": values for i, values in enumerate(old.values())},
+                )
+                self.spills += 1
+
+    def _load(self, key):
+        """Cached columns for `key` from memory or the spill folder, or None"""
+        columns = self._entries.get(key)
+        if columns is not None:
+            self._entries.move_to_end(key)
+            return columns
+        if self.spill_dir is None or not os.path.exists(self._spill_path(key)):
+            return None
+        with np.load(self._spill_path(key)) as saved:
+            names = [str(name) for name in saved["names"]]
+            columns = {name: saved[f"c{i}"] for i, name in enumerate(names)}
+        self.disk_hits += 1
+        self._store(key, columns)
+        return columns
+
+    # =============== Memoization ===============
+    def apply(self, fn, data, symbol=None, **kwargs):
+        """
+        `fn(data, **kwargs)` with its result columns served from the cache
+        when the input fingerprint has been seen before. `fn` must only read
+        Close and the columns it adds itself.
+        """
+        key = (
+            fn.__qualname__,
+            tuple(sorted(kwargs.items())),
+            fingerprint(data, symbol),
+        )
+        with self._lock:
+            columns = self._load(key)
+            if columns is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if columns is None:
+            work = pd.DataFrame({"Close": data["Close"]})
+            work = fn(work, **kwargs)
+            columns = {
+                name: work[name].to_numpy(copy=True)
+                for name in work.columns
+                if name != "Close"
+            }
+            with self._lock:
+                self._store(key, columns)
+        for name, values in columns.items():
+            data[name] = values.copy()
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+_default_cache = None
+
+
+def get_indicator_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache
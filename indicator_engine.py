@@ -0,0 +1,116 @@
+"""
+Vectorized indicator engine for many symbols at once.
+
+Works on a 2-D close-price panel (dates x symbols) and computes the same
+50/200 MA, RSI and MACD columns as `calculate_moving_averages`,
+`calculate_RSI` and `calculate_MACD` for every symbol in one pass:
+rolling means come from cumulative sums and EMAs from a recursive filter
+stepped over dates for all symbols together. Symbols listed later than
+others simply have leading NaN rows in the panel.
+
+tests/test_indicator_engine.py compares every column against the pandas
+formulas on the bundled CSV files.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rsi_kernel import rsi_kernel
+
+
+# =============== Panel Helpers ===============
+def build_close_panel(frames):
+    """
+    Align the Close columns of {symbol: DataFrame} on a common date index.
+    Returns (dates, symbols, close) where close has shape (dates, symbols).
+    """
+    symbols = list(frames)
+    closes = pd.concat({symbol: frames[symbol]["Close"] for symbol in symbols}, axis=1)
+    closes = closes.sort_index()
+    return closes.index, symbols, closes.to_numpy(dtype=np.float64)
+
+
+# =============== Kernels ===============
+def rolling_mean(values, window):
+    """
+    Rolling mean along axis 0 (pandas `rolling(window).mean()`): NaN until
+    `window` valid values are available, and NaN for windows containing NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    zero_pad = np.zeros((1,) + values.shape[1:])
+    sums = np.concatenate([zero_pad, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.concatenate([zero_pad, np.cumsum(valid, axis=0)])
+
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] < window:
+        return out
+    window_sum = sums[window:] - sums[:-window]
+    window_count = counts[window:] - counts[:-window]
+    out[window - 1 :] = np.where(window_count == window, window_sum / window, np.nan)
+    return out
+
+
+def ewm_mean(values, span):
+    """
+    Exponential moving average along axis 0, matching pandas
+    `ewm(span=span, adjust=False).mean()` including its NaN handling.
+    The recursion runs over dates; every step updates all symbols at once.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+
+    out = np.empty(values.shape)
+    if len(values) == 0:
+        return out
+    weighted = values[0].copy()
+    old_wt = np.ones(values.shape[1:])
+    out[0] = weighted
+    for i in range(1, values.shape[0]):
+        cur = values[i]
+        is_obs = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+
+        # Decay the running weight for started series (also across gaps)
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        update = started & is_obs & (weighted != cur)
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update, blended, weighted)
+        old_wt = np.where(started & is_obs, 1.0, old_wt)
+
+        # Series that start at this row take the first observation as-is
+        weighted = np.where(~started & is_obs, cur, weighted)
+        out[i] = weighted
+    return out
+
+
+def rsi(close, window=14, method="sma"):
+    """RSI along axis 0; method="sma" is the formula of `calculate_RSI`"""
+    return rsi_kernel(close, window, method)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """Return (EMA_fast, EMA_slow, MACD, MACD_signal) arrays"""
+    ema_fast = ewm_mean(close, fast)
+    ema_slow = ewm_mean(close, slow)
+    macd_line = ema_fast - ema_slow
+    return ema_fast, ema_slow, macd_line, ewm_mean(macd_line, signal)
+
+
+def compute_indicators(close, rsi_window=14, fast=12, slow=26, signal=9):
+    """
+    Compute every indicator column used by the forecast pipeline for a
+    (dates x symbols) close panel. Returns {column name: 2-D array}.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    ema_fast, ema_slow, macd_line, macd_signal = macd(close, fast, slow, signal)
+    return {
+        "50MA": rolling_mean(close, 50),
+        "200MA": rolling_mean(close, 200),
+        "RSI": rsi(close, rsi_window),
+        "EMA_fast": ema_fast,
+        "EMA_slow": ema_slow,
+        "MACD": macd_line,
+        "MACD_signal": macd_signal,
+    }
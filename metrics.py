@@ -0,0 +1,110 @@
+"""
+Prometheus metrics for the prediction pipeline.
+
+`StageHistogram` is an instrumentation hook (see instrumentation.py) that
+keeps a latency histogram per pipeline stage, plus the bytes each stage
+allocated while tracemalloc is tracing. `render_metrics()` turns it
+and any extra counters into the Prometheus text exposition format.
+"""
+
+import threading
+
+from instrumentation import add_hook
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+    return "{" + pairs + "}"
+
+
+def format_counter(name, help_text, samples):
+    """Counter lines; `samples` is a list of (labels dict, value)"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(labels)} {value}")
+    return lines
+
+
+class StageHistogram:
+    """Per-stage latency histogram, fed by the stage() hooks"""
+
+    name = "stock_stage_duration_seconds"
+    allocated_name = "stock_stage_allocated_bytes"
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self._stages = {}  # stage -> [bucket counts..., count, sum]
+        self._allocated = {}  # stage -> [count, sum] of traced stages
+        self._lock = threading.Lock()
+
+    def __call__(self, stage, seconds, allocated):
+        with self._lock:
+            if allocated is not None:
+                totals = self._allocated.setdefault(stage, [0, 0])
+                totals[0] += 1
+                totals[1] += allocated
+            row = self._stages.get(stage)
+            if row is None:
+                row = self._stages[stage] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += seconds
+
+    def lines(self):
+        lines = [
+            f"# HELP {self.name} Duration of each prediction pipeline stage",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            stages = {stage: list(row) for stage, row in self._stages.items()}
+            allocated = {stage: list(row) for stage, row in self._allocated.items()}
+        for stage, row in sorted(stages.items()):
+            for bound, count in zip(self.buckets, row):
+                labels = format_labels({"stage": stage, "le": bound})
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = format_labels({"stage": stage, "le": "+Inf"})
+            lines.append(f"{self.name}_bucket{labels} {row[-2]}")
+            labels = format_labels({"stage": stage})
+            lines.append(f"{self.name}_sum{labels} {row[-1]}")
+            lines.append(f"{self.name}_count{labels} {row[-2]}")
+        if allocated:
+            lines.append(
+                f"# HELP {self.allocated_name} Peak bytes allocated in each stage"
+            )
+            lines.append(f"# TYPE {self.allocated_name} summary")
+        for stage, (count, total) in sorted(allocated.items()):
+            labels = format_labels({"stage": stage})
+            lines.append(f"{self.allocated_name}_sum{labels} {total}")
+            lines.append(f"{self.allocated_name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics(histogram, counters=()):
+    """Exposition text for `histogram` plus (name, help, samples) counters"""
+    lines = histogram.lines()
+    for name, help_text, samples in counters:
+        lines.extend(format_counter(name, help_text, samples))
+    return "\n".join(lines) + "\n"
+
+
+_default_histogram = None
+
+
+def get_stage_histogram():
+    """Process-wide stage histogram, registered as a hook on first use"""
+    global _default_histogram
+    if _default_histogram is None:
+        _default_histogram = add_hook(StageHistogram())
+    return _default_histogram
@@ -0,0 +1,66 @@
+"""
+Model backends for the forecast.
+
+Every backend names the features it needs and builds an unfitted sklearn
+estimator. Backends that only predict one value (HistGradientBoosting) are
+wrapped in MultiOutputRegressor for direct multi-step targets. scikit-learn
+is only imported when a model is built.
+
+    random_forest  200-tree Random Forest (the original model)
+    tiny_forest    20 shallow trees: fast to train, small on disk
+    hist_gbm       histogram gradient boosting
+    ridge          ridge regression on indicators plus lagged closes
+"""
+
+from features import FEATURES, LAG_FEATURES
+
+DEFAULT_BACKEND = "random_forest"
+
+BACKENDS = {
+    "random_forest": {
+        "label": "Random Forest",
+        "features": FEATURES,
+        "params": {"n_estimators": 200, "random_state": 42},
+    },
+    "tiny_forest": {
+        "label": "Tiny Forest",
+        "features": FEATURES,
+        "params": {"n_estimators": 20, "max_depth": 8, "random_state": 42},
+    },
+    "hist_gbm": {
+        "label": "Histogram GBM",
+        "features": FEATURES,
+        "params": {"max_iter": 100, "random_state": 42},
+    },
+    "ridge": {
+        "label": "Ridge (lagged features)",
+        "features": LAG_FEATURES,
+        "params": {"alpha": 1.0},
+    },
+}
+
+
+def get_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {name}")
+    return BACKENDS[name]
+
+
+def make_model(name, multi_output=False, n_jobs=-1):
+    """Unfitted estimator for backend `name`"""
+    params = get_backend(name)["params"]
+    if name in ("random_forest", "tiny_forest"):
+        from sklearn.ensemble import RandomForestRegressor
+
+        return RandomForestRegressor(**params, n_jobs=n_jobs)
+    if name == "hist_gbm":
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        from sklearn.multioutput import MultiOutputRegressor
+
+        model = HistGradientBoostingRegressor(**params)
+        return MultiOutputRegressor(model, n_jobs=n_jobs) if multi_output else model
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return make_pipeline(StandardScaler(), Ridge(**params))
@@ -0,0 +1,259 @@
+"""
+Disk-backed registry of fitted forecast models.
+
+Models are keyed by (symbol, feature set, last training date, hyperparameters)
+and pickled under the registry folder together with an `index.json` that
+records when each model was last used. A cached model is reused until more
+than `max_stale_bars` new bars have arrived since it was trained. Models
+saved by a previous run are unpickled on first use (or all at once with
+preload()).
+
+Several processes (gunicorn workers) may share the folder: every change to
+the index and every model deletion happens under an flock on `.lock`, after
+merging in the index other processes have written, and index.json is
+replaced atomically. Lookups write their use times back at most every
+INDEX_SYNC_SECONDS. A model another process has deleted counts as a miss.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import pandas as pd
+
+from price_store import file_lock
+
+DEFAULT_MODEL_DIR = os.environ.get("MODEL_CACHE_DIR", "model_cache")
+DEFAULT_MAX_MODELS = int(os.environ.get("MODEL_CACHE_MAX_MODELS", "50"))
+DEFAULT_MAX_BYTES = int(os.environ.get("MODEL_CACHE_MAX_BYTES", str(1024**3)))
+DEFAULT_MAX_STALE_BARS = int(os.environ.get("MODEL_MAX_STALE_BARS", "0"))
+INDEX_SYNC_SECONDS = 60
+
+
+def model_key(symbol, features, trained_until, params):
+    params_json = json.dumps(params, sort_keys=True)
+    return f"{symbol}|{','.join(features)}|{trained_until.isoformat()}|{params_json}"
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        root=DEFAULT_MODEL_DIR,
+        max_models=DEFAULT_MAX_MODELS,
+        max_bytes=DEFAULT_MAX_BYTES,
+        max_stale_bars=DEFAULT_MAX_STALE_BARS,
+    ):
+        self.root = root
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.max_stale_bars = max_stale_bars
+        self._entries = OrderedDict()  # key -> entry dict, least recently used first
+        self._lock = threading.Lock()
+        self._synced_at = 0.0  # when this process last merged and saved the index
+        # Lookups made through get_or_train(), and models trained per backend
+        self.hits = 0
+        self.misses = 0
+        self.trained = Counter()
+        self._load_index()
+
+    # =============== Persistence ===============
+    def _index_path(self):
+        return os.path.join(self.root, "index.json")
+
+    def _file_lock(self):
+        """Serializes index changes and deletions between processes"""
+        return file_lock(os.path.join(self.root, ".lock"))
+
+    def _read_index(self):
+        """Entries of the index on disk, least recently used first (no models)"""
+        entries = OrderedDict()
+        if not os.path.exists(self._index_path()):
+            return entries
+        with open(self._index_path(), encoding="utf-8") as f:
+            saved = json.load(f)
+        for meta in sorted(saved, key=lambda meta: meta.get("last_used", 0)):
+            if not os.path.exists(os.path.join(self.root, meta["file"])):
+                continue
+            entry = dict(meta, model=None)
+            entry["trained_until"] = pd.Timestamp(meta["trained_until"])
+            entry.setdefault("last_used", 0)
+            entries[meta["key"]] = entry
+        return entries
+
+    def _merge_index(self):
+        """
+        Replace the in-memory entries with the index on disk, keeping the
+        models already loaded and the later use time of each entry. Call with
+        both locks held.
+        """
+        merged = self._read_index()
+        for key, entry in merged.items():
+            mine = self._entries.get(key)
+            if mine is not None:
+                entry["model"] = mine["model"]
+                entry["last_used"] = max(entry["last_used"], mine["last_used"])
+        self._entries = OrderedDict(
+            sorted(merged.items(), key=lambda item: item[1]["last_used"])
+        )
+
+    def _load_index(self):
+        """Reload the index saved by a previous run; models stay on disk"""
+        if not os.path.exists(self._index_path()):
+            return
+        with self._lock, self._file_lock():
+            self._merge_index()
+            self._evict()
+            self._save_index()
+
+    def _model(self, entry):
+        """The entry's model, unpickled on first use (None if its file is gone)"""
+        if entry["model"] is None:
+            try:
+                with open(os.path.join(self.root, entry["file"]), "rb") as f:
+                    entry["model"] = pickle.load(f)
+            except FileNotFoundError:
+                # Evicted or superseded by another process
+                self._entries.pop(entry["key"], None)
+        return entry["model"]
+
+    def preload(self):
+        """Unpickle every model now instead of on first use"""
+        with self._lock:
+            for entry in list(self._entries.values()):
+                self._model(entry)
+
+    def _save_index(self):
+        """Write the index atomically; call with both locks held"""
+        os.makedirs(self.root, exist_ok=True)
+        saved = []
+        for entry in self._entries.values():
+            meta = {k: v for k, v in entry.items() if k != "model"}
+            meta["trained_until"] = entry["trained_until"].isoformat()
+            saved.append(meta)
+        path = self._index_path()
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2)
+        os.replace(path + ".tmp", path)
+        self._synced_at = time.time()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        path = os.path.join(self.root, entry["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _evict(self):
+        """Drop least recently used models until the count/size limits hold"""
+        while self._entries and (
+            len(self._entries) > self.max_models or self.total_bytes() > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    # =============== Lookup ===============
+    def total_bytes(self):
+        return sum(entry["size"] for entry in self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _latest(self, symbol, features, params):
+        matches = [
+            entry
+            for entry in self._entries.values()
+            if entry["symbol"] == symbol
+            and entry["features"] == list(features)
+            and entry["params"] == params
+        ]
+        return max(matches, key=lambda e: e["trained_until"], default=None)
+
+    def get(self, symbol, features, params, index):
+        """
+        Return a cached model that is still fresh for the bars in `index`,
+        or None when the model is missing or too stale.
+        """
+        with self._lock:
+            entry = self._latest(symbol, features, params)
+            if entry is None:
+                return None
+            new_bars = int((index > entry["trained_until"]).sum())
+            if new_bars > self.max_stale_bars:
+                return None
+            model = self._model(entry)
+            if model is None:
+                return None
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(entry["key"])
+            if entry["last_used"] - self._synced_at > INDEX_SYNC_SECONDS:
+                with self._file_lock():
+                    self._merge_index()
+                    self._save_index()
+            return model
+
+    def put(self, symbol, features, params, trained_until, model):
+        blob = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        key = model_key(symbol, features, trained_until, params)
+        file_name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".pkl"
+        with self._lock, self._file_lock():
+            # Other processes may have added, superseded or evicted models
+            self._merge_index()
+            path = os.path.join(self.root, file_name)
+            with open(path + ".tmp", "wb") as f:
+                f.write(blob)
+            os.replace(path + ".tmp", path)
+            # A newer model supersedes older ones for the same configuration
+            # (but not a newer one another process has just saved)
+            for old in [
+                e["key"]
+                for e in self._entries.values()
+                if e["symbol"] == symbol
+                and e["features"] == list(features)
+                and e["params"] == params
+                and e["trained_until"] < trained_until
+            ]:
+                self._remove(old)
+            self._entries[key] = {
+                "key": key,
+                "file": file_name,
+                "size": len(blob),
+                "symbol": symbol,
+                "features": list(features),
+                "params": params,
+                "trained_until": trained_until,
+                "last_used": time.time(),
+                "model": model,
+            }
+            self._entries.move_to_end(key)
+            self._evict()
+            self._save_index()
+
+    def get_or_train(self, symbol, features, params, index, train):
+        """
+        Return (model, source) where source is "cached" or "trained".
+        `train` is called with no arguments only when no fresh model exists.
+        """
+        model = self.get(symbol, features, params, index)
+        if model is not None:
+            with self._lock:
+                self.hits += 1
+            return model, "cached"
+        with self._lock:
+            self.misses += 1
+        model = train()
+        self.put(symbol, features, params, index[-1], model)
+        with self._lock:
+            self.trained[params.get("backend")] += 1
+        return model, "trained"
+
+
+_default_registry = None
+
+
+def get_registry():
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
@@ -0,0 +1,85 @@
+"""
+Background job queue for predictions.
+
+Jobs run on a bounded thread pool (model training itself is handed to the
+training service's process pool). Submitting a key that already has a
+queued or running job returns that job instead of starting a second
+computation, so simultaneous requests for one symbol share the work.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_JOB_WORKERS = int(os.environ.get("PREDICTION_JOB_WORKERS", "4"))
+DEFAULT_MAX_FINISHED = int(os.environ.get("PREDICTION_JOB_HISTORY", "1000"))
+
+
+class JobQueue:
+    def __init__(
+        self, run, workers=DEFAULT_JOB_WORKERS, max_finished=DEFAULT_MAX_FINISHED
+    ):
+        """`run` is called as run(key) in a worker thread and returns the job result"""
+        self.run = run
+        self.max_finished = max_finished
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="prediction-job"
+        )
+        self._jobs = OrderedDict()  # job id -> job dict, oldest first
+        self._active = {}  # key -> id of its queued/running job
+        self._lock = threading.Lock()
+
+    def submit(self, key):
+        """Queue a job for `key` (or join the one in flight) and return its state"""
+        with self._lock:
+            job_id = self._active.get(key)
+            if job_id is not None:
+                return dict(self._jobs[job_id], coalesced=True)
+            job = {
+                "id": uuid.uuid4().hex,
+                "key": key,
+                "status": "queued",
+                "result": None,
+                "error": None,
+                "submitted_at": time.time(),
+                "finished_at": None,
+            }
+            self._jobs[job["id"]] = job
+            self._active[key] = job["id"]
+        self._pool.submit(self._execute, job)
+        return dict(job, coalesced=False)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else dict(job)
+
+    def _execute(self, job):
+        with self._lock:
+            job["status"] = "running"
+        try:
+            result, status, error = self.run(job["key"]), "done", None
+        except Exception as e:
+            result, status, error = None, "failed", str(e)
+        with self._lock:
+            job.update(
+                result=result, status=status, error=error, finished_at=time.time()
+            )
+            self._active.pop(job["key"], None)
+            self._trim()
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond `max_finished`"""
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["status"] in ("done", "failed")
+        ]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,450 @@
+"""
+Local on-disk OHLCV store with incremental refresh.
+
+Every symbol gets its own folder under the store root:
+
+    price_store/TATAMOTORS.NS/
+        Date.bin          int64 epoch nanoseconds (UTC)
+        Open.bin ...      one raw column file per OHLCV field
+        meta.json         timezone of the bars
+
+Column files are plain little-endian arrays, so they can be memory-mapped
+with numpy and new bars are appended to the end of each file in place.
+meta.json also records how far back the history has been requested, so a
+longer period later fetches the missing older bars.
+
+Reads and writes of a symbol hold its lock (a thread lock plus an flock on
+`.lock` in the symbol folder, so gunicorn workers are serialized too), and
+meta.json is replaced atomically.
+"""
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: threads are still serialized, processes are not
+    fcntl = None
+
+DEFAULT_STORE_DIR = os.environ.get("PRICE_STORE_DIR", "price_store")
+DEFAULT_PROVIDER = os.environ.get("PRICE_PROVIDER", "yahoo")
+
+# Ticker characters Yahoo Finance uses (RELIANCE.NS, ^NSEI, EURINR=X, BRK-B)
+SYMBOL_PATTERN = re.compile(r"[A-Za-z0-9.^=-]+")
+
+# Same schema as the *_stock_data.csv dumps (before indicators are added)
+COLUMNS = {
+    "Open": np.float64,
+    "High": np.float64,
+    "Low": np.float64,
+    "Close": np.float64,
+    "Volume": np.int64,
+    "Dividends": np.float64,
+    "Stock Splits": np.float64,
+}
+
+# Compact representation: float32 prices, no Dividends / Stock Splits
+COMPACT_COLUMNS = {
+    "Open": np.float32,
+    "High": np.float32,
+    "Low": np.float32,
+    "Close": np.float32,
+    "Volume": np.int64,
+}
+
+
+# =============== Data Providers ===============
+class YahooProvider:
+    """Download bars from Yahoo Finance"""
+
+    def history(self, symbol, start=None, period="5y"):
+        import yfinance as yf
+
+        stock = yf.Ticker(symbol)
+        if start is not None:
+            return stock.history(start=start)
+        return stock.history(period=period)
+
+
+class CsvProvider:
+    """
+    Offline stub provider that serves bars from the checked-in
+    `<symbol>_stock_data.csv` files, useful for tests and benchmarks.
+    """
+
+    def __init__(self, folder=".", tz="Asia/Kolkata"):
+        self.folder = folder
+        self.tz = tz
+
+    def history(self, symbol, start=None, period="5y"):
+        path = os.path.join(self.folder, f"{symbol}_stock_data.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=list(COLUMNS))
+        data = pd.read_csv(path, index_col="Date")
+        data.index = pd.to_datetime(data.index, utc=True).tz_convert(self.tz)
+        data.index.name = "Date"
+        data = data[[c for c in COLUMNS if c in data.columns]]
+        if start is None and len(data):
+            start = period_start(data.index[-1], period)
+        if start is not None:
+            data = data[data.index >= _as_timestamp(start, data.index.tz)]
+        return data
+
+
+PROVIDERS = {"yahoo": YahooProvider, "csv": CsvProvider}
+
+
+def get_provider(name=None):
+    """Return a provider instance by name ("yahoo" or "csv")"""
+    name = name or DEFAULT_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown price provider: {name}")
+    return PROVIDERS[name]()
+
+
+# =============== Helpers ===============
+def is_valid_symbol(symbol):
+    """Whether `symbol` is a ticker that is safe to use as a folder name"""
+    return (
+        isinstance(symbol, str)
+        and SYMBOL_PATTERN.fullmatch(symbol) is not None
+        and ".." not in symbol
+    )
+
+
+def _as_timestamp(value, tz):
+    ts = pd.Timestamp(value)
+    if tz is not None and ts.tzinfo is None:
+        ts = ts.tz_localize(tz)
+    return ts
+
+
+def period_start(end, period):
+    """Convert a yfinance style period ("5y", "6mo", "30d", "max") to a start date"""
+    if period in (None, "max"):
+        return None
+    for suffix, unit in (("mo", "months"), ("y", "years"), ("d", "days")):
+        if period.endswith(suffix):
+            count = int(period[: -len(suffix)])
+            return end - pd.DateOffset(**{unit: count})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+# =============== Locking ===============
+class SymbolLock:
+    """
+    Reentrant lock on one symbol: an RLock between threads and an exclusive
+    flock on `path` between processes (taken by the outermost holder).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "a")
+                if fcntl is not None:
+                    fcntl.flock(self._file, fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+
+_symbol_locks = {}
+_symbol_locks_guard = threading.Lock()
+
+
+def file_lock(path):
+    """The SymbolLock on `path` shared by every caller in this process"""
+    path = os.path.abspath(path)
+    with _symbol_locks_guard:
+        if path not in _symbol_locks:
+            _symbol_locks[path] = SymbolLock(path)
+        return _symbol_locks[path]
+
+
+# =============== Price Store ===============
+class PriceStore:
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+
+    def lock(self, symbol):
+        """The lock every read and write of `symbol` holds"""
+        return file_lock(os.path.join(self._folder(symbol), ".lock"))
+
+    def _folder(self, symbol):
+        if not is_valid_symbol(symbol):
+            raise ValueError(f"Invalid symbol: {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _path(self, symbol, column):
+        return os.path.join(self._folder(symbol), f"{column}.bin")
+
+    def _read_meta(self, symbol):
+        path = os.path.join(self._folder(symbol), "meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, symbol, meta):
+        path = os.path.join(self._folder(symbol), "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _column(self, symbol, column, dtype):
+        path = self._path(symbol, column)
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "meta.json"))
+        )
+
+    def row_count(self, symbol):
+        with self.lock(symbol):
+            if self._read_meta(symbol) is None:
+                return 0
+            return os.path.getsize(self._path(symbol, "Date")) // 8
+
+    def _date_at(self, symbol, position):
+        with self.lock(symbol):
+            meta = self._read_meta(symbol)
+            if meta is None or self.row_count(symbol) == 0:
+                return None
+            dates = self._column(symbol, "Date", np.int64)
+            return pd.Timestamp(int(dates[position]), tz="UTC").tz_convert(meta["tz"])
+
+    def first_date(self, symbol):
+        """Timestamp of the first stored bar, or None if the symbol is not stored"""
+        return self._date_at(symbol, 0)
+
+    def last_date(self, symbol):
+        """Timestamp of the last stored bar, or None if the symbol is not stored"""
+        return self._date_at(symbol, -1)
+
+    def history_start(self, symbol):
+        """
+        Start of the history requested so far: a Timestamp, "max", or None
+        if the symbol is not stored (falls back to the first stored bar).
+        """
+        with self.lock(symbol):
+            meta = self._read_meta(symbol)
+            if meta is None:
+                return None
+            since = meta.get("since")
+            if since is None:
+                return self.first_date(symbol)
+            return since if since == "max" else pd.Timestamp(since)
+
+    def read(self, symbol, start=None, compact=False):
+        """
+        Read stored bars as a DataFrame indexed by Date (oldest first).
+        With `compact=True` only COMPACT_COLUMNS are loaded, as float32.
+        """
+        schema = COMPACT_COLUMNS if compact else COLUMNS
+        with self.lock(symbol):
+            return self._read(symbol, start, schema)
+
+    def _read(self, symbol, start, schema):
+        meta = self._read_meta(symbol)
+        if meta is None:
+            return pd.DataFrame(columns=list(schema))
+        dates = self._column(symbol, "Date", np.int64)
+        first = 0
+        if start is not None:
+            start = _as_timestamp(start, meta["tz"])
+            first = int(np.searchsorted(dates, start.value, side="left"))
+        index = pd.DatetimeIndex(
+            pd.to_datetime(dates[first:], utc=True), name="Date"
+        ).tz_convert(meta["tz"])
+        # Copies, not views of the memory maps: a later append may truncate
+        # the files under them
+        columns = {
+            name: np.array(
+                self._column(symbol, name, COLUMNS[name])[first:], dtype=dtype
+            )
+            for name, dtype in schema.items()
+        }
+        return pd.DataFrame(columns, index=index)
+
+    def append(self, symbol, data, since=None, replace=False):
+        """
+        Append bars to the store in place. Stored bars on or after the first
+        new bar are replaced, so a partial last bar gets refreshed; with
+        `replace=True` all stored bars are. `since` (a Timestamp or "max")
+        records how far back the history now goes.
+        """
+        if data is None or data.empty:
+            return 0
+        with self.lock(symbol):
+            return self._append(symbol, data, since, replace)
+
+    def _append(self, symbol, data, since, replace):
+        data = data.sort_index(ascending=True)
+        data = data[~data.index.duplicated(keep="last")]
+        tz = str(data.index.tz) if data.index.tz is not None else "UTC"
+        index = (
+            data.index if data.index.tz is not None else data.index.tz_localize("UTC")
+        )
+        new_dates = index.tz_convert("UTC").as_unit("ns").asi8
+
+        os.makedirs(self._folder(symbol), exist_ok=True)
+        keep = 0
+        meta = self._read_meta(symbol)
+        if meta is not None and not replace:
+            stored = self._column(symbol, "Date", np.int64)
+            keep = int(np.searchsorted(stored, new_dates[0], side="left"))
+            del stored
+
+        arrays = {"Date": new_dates}
+        for name, dtype in COLUMNS.items():
+            values = (
+                data[name] if name in data.columns else pd.Series(0, index=data.index)
+            )
+            arrays[name] = values.to_numpy(dtype=dtype)
+
+        for name, values in arrays.items():
+            path = self._path(symbol, name)
+            with open(path, "ab") as f:
+                f.truncate(keep * values.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                values.astype(values.dtype.newbyteorder("<"), copy=False).tofile(f)
+
+        meta = dict(meta or {}, tz=tz)
+        if since is not None:
+            meta["since"] = since if since == "max" else since.isoformat()
+        self._write_meta(symbol, meta)
+        return len(new_dates)
+
+
+_default_store = None
+
+
+def get_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
+
+
+def compact_prices(data):
+    """Compact copy of a price frame: float32 prices, no Dividends / Stock Splits"""
+    return pd.DataFrame(
+        {
+            name: data[name].to_numpy(dtype=dtype)
+            for name, dtype in COMPACT_COLUMNS.items()
+        },
+        index=data.index,
+    )
+
+
+def _covers(since, wanted):
+    """
+    Whether history starting at `since` covers a request starting at
+    `wanted` (None or "max" for the whole history)
+    """
+    if since is None:
+        return False
+    if since == "max":
+        return True
+    if wanted is None or wanted == "max":
+        return False
+    return since.date() <= wanted.date()
+
+
+def _new_corporate_action(new_data, stored):
+    """
+    Whether `new_data` reports a split or dividend that `stored` (the bars
+    stored from the first new day on) does not, so the provider has
+    re-adjusted the bars before it
+    """
+    for name in ("Stock Splits", "Dividends"):
+        if name not in new_data.columns:
+            continue
+        new = new_data[name].fillna(0)
+        old = stored[name].reindex(new.index).fillna(0)
+        if (new != old).any():
+            return True
+    return False
+
+
+def load_prices(symbol, period="5y", store=None, provider=None, compact=False):
+    """
+    Return `period` worth of bars for `symbol`, reading the local store first
+    and fetching only the missing tail since the last stored bar (or, for a
+    longer period than stored so far, the whole requested range once).
+    A split or dividend in the tail refetches the stored history, since the
+    provider adjusts the bars before it. `compact=True` returns the float32
+    representation (see COMPACT_COLUMNS).
+    """
+    store = store or get_store()
+    provider = provider or get_provider()
+
+    # Concurrent refreshes of one symbol wait for each other, then find the
+    # tail already stored
+    with store.lock(symbol):
+        last = store.last_date(symbol)
+        replace = False
+        if last is None:
+            new_data = provider.history(symbol, period=period)
+        else:
+            wanted = period_start(last, period)
+            stored_since = store.history_start(symbol)
+            if _covers(stored_since, wanted):
+                # Refetch from the last stored day so an intraday bar is refreshed
+                new_data = provider.history(symbol, start=last.date())
+                if _new_corporate_action(new_data, store.read(symbol, start=last)):
+                    replace = True
+                    if stored_since == "max":
+                        new_data = provider.history(symbol, period="max")
+                    else:
+                        new_data = provider.history(symbol, start=stored_since.date())
+            elif wanted is None:
+                new_data = provider.history(symbol, period=period)
+            else:
+                new_data = provider.history(symbol, start=wanted.date())
+        last_new = new_data.index[-1] if len(new_data) else last
+        since = stored_since if replace else None
+        if last_new is not None and not replace:
+            since = period_start(last_new, period) or "max"
+            if _covers(store.history_start(symbol), since):
+                since = None
+        store.append(symbol, new_data, since=since, replace=replace)
+
+        last = store.last_date(symbol)
+        if last is None:
+            return pd.DataFrame(columns=list(COMPACT_COLUMNS if compact else COLUMNS))
+        return store.read(symbol, start=period_start(last, period), compact=compact)
@@ -0,0 +1,154 @@
+"""
+Streaming HTML / CSV report writer.
+
+The page header, the table rows and the footer are written to the file as
+they are produced, `chunk_size` rows at a time, so memory stays flat however
+long the history is. `data` can be one DataFrame or an iterable of them
+(e.g. one per symbol for a multi-symbol export); the columns come from the
+first chunk and the index is written as the first column(s).
+
+With `page_size`, rows are grouped into one <tbody> per page and only the
+current page is shown; a few lines of JavaScript page through them, so the
+browser lays out a single page however many rows the file holds.
+"""
+
+import html
+
+import numpy as np
+import pandas as pd
+
+STYLESHEET = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css"
+CHUNK_SIZE = 10_000
+
+PAGER_SCRIPT = """
+<div class="d-flex justify-content-center align-items-center gap-3 my-2">
+    <button class="btn btn-sm btn-outline-primary" onclick="showPage(-1)">Previous</button>
+    <span id="page-label"></span>
+    <button class="btn btn-sm btn-outline-primary" onclick="showPage(1)">Next</button>
+</div>
+<script>
+    var pages = document.querySelectorAll("tbody.page"), current = 0;
+    function showPage(step) {
+        pages[current].hidden = true;
+        current = Math.min(Math.max(current + step, 0), pages.length - 1);
+        pages[current].hidden = false;
+        document.getElementById("page-label").textContent =
+            "Page " + (current + 1) + " of " + pages.length;
+    }
+    showPage(0);
+</script>
+"""
+
+
+def iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """Split a DataFrame (or each DataFrame of an iterable) into row chunks"""
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for frame in frames:
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start : start + chunk_size]
+
+
+def format_column(column, float_format):
+    """Cell strings for one column; missing values become empty cells"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.astype(str).tolist()
+    values = column.to_numpy()
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        cells = [float_format.format(v) for v in values.tolist()]
+        return ["" if m else c for c, m in zip(cells, missing.tolist())]
+    if values.dtype.kind in "iub":
+        return [str(v) for v in values.tolist()]
+    return ["" if pd.isna(v) else html.escape(str(v)) for v in values.tolist()]
+
+
+def table_rows(chunk, index, float_format):
+    """HTML <tr> rows for a chunk"""
+    if index:
+        chunk = chunk.reset_index()
+    columns = [format_column(chunk[c], float_format) for c in chunk]
+    return "".join(
+        "<tr><td>" + "</td><td>".join(row) + "</td></tr>\n" for row in zip(*columns)
+    )
+
+
+def _page_attrs(page_size, page):
+    """<tbody> attributes; every page after the first starts hidden"""
+    if not page_size:
+        return ""
+    return ' class="page"' + (" hidden" if page else "")
+
+
+def write_html_report(
+    path,
+    data,
+    title="",
+    header_html="",
+    index=True,
+    chunk_size=CHUNK_SIZE,
+    page_size=None,
+    float_format="{:.2f}",
+):
+    """
+    Write `data` as a Bootstrap-styled HTML table to `path`. `header_html`
+    is placed above the table. Returns the number of rows written.
+    """
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<html>\n<head>\n"
+            f'<link rel="stylesheet" href="{STYLESHEET}">\n'
+            "<style>th, td {text-align:center} p {margin:2px 0}</style>\n"
+            "</head>\n<body>\n"
+            '<div class="container my-3">\n'
+        )
+        if title:
+            f.write(f"<h4>{html.escape(title)}</h4>\n")
+        f.write(header_html)
+        f.write('\n<table class="table table-striped table-bordered">\n')
+
+        page_rows = 0
+        for chunk in iter_chunks(data, chunk_size):
+            if rows == 0:
+                names = list(chunk.index.names) if index else []
+                names = [n if n is not None else "index" for n in names]
+                names += [str(c) for c in chunk.columns]
+                f.write("<thead><tr>")
+                f.write("".join(f"<th>{html.escape(n)}</th>" for n in names))
+                f.write("</tr></thead>\n<tbody" + _page_attrs(page_size, 0) + ">\n")
+            if page_size:
+                # Start a new <tbody> at every page boundary
+                start = 0
+                while start < len(chunk):
+                    if page_rows == page_size:
+                        f.write("</tbody>\n<tbody" + _page_attrs(page_size, 1) + ">\n")
+                        page_rows = 0
+                    take = min(page_size - page_rows, len(chunk) - start)
+                    f.write(
+                        table_rows(
+                            chunk.iloc[start : start + take], index, float_format
+                        )
+                    )
+                    page_rows += take
+                    start += take
+            else:
+                f.write(table_rows(chunk, index, float_format))
+            rows += len(chunk)
+
+        if rows:
+            f.write("</tbody>\n")
+        f.write("</table>\n")
+        if page_size and rows > page_size:
+            f.write(PAGER_SCRIPT)
+        f.write("</div>\n</body>\n</html>\n")
+    return rows
+
+
+def write_csv(path, data, index=True, chunk_size=CHUNK_SIZE):
+    """Write `data` to `path` chunk by chunk; returns the number of rows written"""
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for chunk in iter_chunks(data, chunk_size):
+            chunk.to_csv(f, index=index, header=rows == 0)
+            rows += len(chunk)
+    return rows
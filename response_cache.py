@@ -0,0 +1,54 @@
+"""
+Small thread-safe in-process TTL cache for API responses.
+`hits` / `misses` count the lookups made with get().
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value), oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Value for `key`, or None when missing or expired"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def get_stale(self, key):
+        """Value for `key` even if it has expired (None when missing)"""
+        with self._lock:
+            item = self._entries.get(key)
+            return None if item is None else item[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def expires_in(self, key):
+        """Seconds until `key` expires (0 when missing or expired)"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return 0
+            return max(0.0, item[0] - time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,204 @@
+"""
+Fused RSI kernel.
+
+The loop kernel makes one pass over the closes of each series: gains and
+losses are derived from consecutive closes on the fly and kept as running
+window sums (method="sma", the simple-average RSI of `calculate_RSI`) or as
+Wilder's recursive averages (method="wilder"), so no delta / gain / loss
+arrays are allocated. It is compiled with Numba when Numba is installed;
+otherwise a vectorized NumPy version computes the same values.
+
+Works on 1-D series and on 2-D (dates x symbols) panels. Leading NaNs of a
+symbol mark the dates before its history starts; a NaN close inside the
+history counts as no change, as with the pandas implementation.
+
+Wilder's RSI seeds both averages with the mean of the first `window`
+price changes and then applies avg = (avg * (window - 1) + value) / window.
+
+tests/test_rsi_kernel.py checks both engines against pandas and a
+textbook Wilder implementation.
+"""
+
+import numpy as np
+
+METHODS = ("sma", "wilder")
+ENGINES = ("auto", "numba", "numpy")
+
+_numba_kernel = None
+
+
+# =============== Loop kernel ===============
+def _rsi_loop(close, window, wilder, out):
+    """Single pass per column; `out` must be NaN-filled with close's shape"""
+    n, m = close.shape
+    for j in range(m):
+        start = 0
+        while start < n and np.isnan(close[start, j]):
+            start += 1
+        sum_gain = 0.0
+        sum_loss = 0.0
+        # Non-zero gains / losses in the SMA window, so that a window without
+        # losses gives exactly 0 rather than a rounding residue
+        n_gain = 0
+        n_loss = 0
+        for i in range(start + 1, n):
+            delta = close[i, j] - close[i - 1, j]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            k = i - start  # price changes seen so far
+            if wilder:
+                if k <= window:
+                    sum_gain += gain
+                    sum_loss += loss
+                    if k < window:
+                        continue
+                    sum_gain /= window
+                    sum_loss /= window
+                else:
+                    sum_gain = (sum_gain * (window - 1) + gain) / window
+                    sum_loss = (sum_loss * (window - 1) + loss) / window
+                avg_gain = sum_gain
+                avg_loss = sum_loss
+            else:
+                sum_gain += gain
+                sum_loss += loss
+                n_gain += gain > 0
+                n_loss += loss > 0
+                # The first window also holds the zero change of the first bar
+                if k > window:
+                    old = close[i - window, j] - close[i - window - 1, j]
+                    if old > 0:
+                        sum_gain -= old
+                        n_gain -= 1
+                    elif old < 0:
+                        sum_loss += old
+                        n_loss -= 1
+                if k < window - 1:
+                    continue
+                avg_gain = sum_gain if n_gain else 0.0
+                avg_loss = sum_loss if n_loss else 0.0
+            if avg_loss == 0.0:
+                out[i, j] = 100.0 if avg_gain > 0 else np.nan
+            else:
+                out[i, j] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _get_numba_kernel():
+    """The loop kernel compiled with Numba (None when Numba is not installed)"""
+    global _numba_kernel
+    if _numba_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            return None
+        _numba_kernel = numba.njit(cache=True, nogil=True)(_rsi_loop)
+    return _numba_kernel
+
+
+# =============== NumPy fallback ===============
+def _window_sums(values, window, dtype=None):
+    """Sums over each `window` consecutive rows, for rows window - 1 onwards"""
+    sums = np.cumsum(values, axis=0, dtype=dtype)
+    sums[window:] -= sums[:-window].copy()
+    return sums[window - 1 :]
+
+
+def _wilder_filter(x, window):
+    """
+    avg = (avg * (window - 1) + x) / window down axis 0 from avg = 0, in place.
+    Blocks of rows are solved in closed form (scaled cumulative sums); the
+    block length keeps the scale factors below 1e3, so rounding stays small.
+    """
+    decay = (window - 1) / window
+    if decay == 0:
+        return x
+    block = max(1, int(np.log(1e3) / -np.log(decay)))
+    powers = decay ** np.arange(block).reshape((-1,) + (1,) * (x.ndim - 1))
+    prev = np.zeros(x.shape[1:])
+    for row in range(0, len(x), block):
+        part = x[row : row + block]
+        scale = powers[: len(part)]
+        part /= scale
+        np.cumsum(part, axis=0, out=part)
+        part *= scale / window
+        part += scale * decay * prev
+        prev = part[-1]
+    return x
+
+
+def _rsi_from_averages(avg_gain, avg_loss, out):
+    """100 - 100 / (1 + avg_gain / avg_loss) into `out`; clobbers avg_gain"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(avg_gain, avg_loss, out=avg_gain)
+    avg_gain += 1.0
+    np.divide(100.0, avg_gain, out=avg_gain)
+    np.subtract(100.0, avg_gain, out=out)
+
+
+def _rsi_numpy(close, window, wilder):
+    n, m = close.shape
+    if n == 0:
+        return np.empty((n, m))
+    valid = ~np.isnan(close)
+    start = valid.argmax(axis=0)  # first bar of each symbol
+    start[~valid.any(axis=0)] = n
+    del valid
+
+    # NaN changes (first bar, gaps) count as no change
+    gain = np.empty((n, m))
+    gain[0] = 0.0
+    np.subtract(close[1:], close[:-1], out=gain[1:])
+    loss = np.negative(gain)
+    np.fmax(gain, 0.0, out=gain)
+    np.fmax(loss, 0.0, out=loss)
+
+    out = np.full((n, m), np.nan)
+    if wilder:
+        # The first average (the mean of the first `window` changes) is fed
+        # in as one value at the seed row; nothing is fed in before it
+        first = start + window
+        for values in (gain, loss):
+            for j in np.flatnonzero(first < n):
+                values[first[j], j] = values[: first[j] + 1, j].sum()
+                values[: first[j], j] = 0.0
+            _wilder_filter(values, window)
+        _rsi_from_averages(gain, loss, out)
+    elif n >= window:
+        first = start + window - 1
+        gain_sums = _window_sums(gain, window)
+        loss_sums = _window_sums(loss, window)
+        # Windows without gains / losses are exactly 0, not a rounding residue
+        gain_sums[_window_sums(gain > 0, window, np.int32) == 0] = 0.0
+        loss_sums[_window_sums(loss > 0, window, np.int32) == 0] = 0.0
+        _rsi_from_averages(gain_sums, loss_sums, out[window - 1 :])
+    else:
+        return out
+    for j in np.flatnonzero(first > 0):
+        out[: first[j], j] = np.nan
+    return out
+
+
+# =============== Public API ===============
+def rsi_kernel(close, window=14, method="sma", engine="auto"):
+    """
+    RSI of `close` along axis 0 (1-D series or 2-D dates x symbols) as
+    float64. engine="auto" uses Numba when it is installed, else NumPy.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown RSI method: {method}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown RSI engine: {engine}")
+    close = np.asarray(close, dtype=np.float64)
+    one_d = close.ndim == 1
+    panel = close.reshape(-1, 1) if one_d else close
+    wilder = method == "wilder"
+
+    kernel = None if engine == "numpy" else _get_numba_kernel()
+    if engine == "numba" and kernel is None:
+        raise ImportError("engine='numba' needs numba (pip install numba)")
+    if kernel is not None:
+        out = np.full(panel.shape, np.nan)
+        kernel(np.ascontiguousarray(panel), window, wilder, out)
+    else:
+        out = _rsi_numpy(panel, window, wilder)
+    return out[:, 0] if one_d else out
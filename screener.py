@@ -0,0 +1,251 @@
+"""
+Batch screener: score a whole watchlist in one run.
+
+Prices are fetched on a bounded thread pool (network I/O) and each symbol
+is analysed on a process pool (indicators, trend, forecast, entry and
+stop-loss). A failing symbol is reported and skipped without stopping
+the run. Results are ranked by expected return and written to one table.
+
+Usage:
+    python3 screener.py watchlist.txt
+    python3 screener.py watchlist.txt --provider csv --output results.csv
+    python3 screener.py watchlist.txt --trend-timeframe 1wk
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from model_backends import BACKENDS, DEFAULT_BACKEND
+from price_store import get_provider, period_start
+from stock_forcast import (
+    calculate_entry_stoploss,
+    calculate_MACD,
+    calculate_moving_averages,
+    calculate_RSI,
+    determin_trend,
+    fetch_stock_data,
+    model_forecast,
+)
+from timeframes import TIMEFRAMES, history_period, resample_bars
+
+RESULT_COLUMNS = [
+    "Symbol",
+    "Trend",
+    "Last Date",
+    "Current Price",
+    "Predicted Price",
+    "Expected Return %",
+    "RSI",
+    "Entry Price",
+    "Stop Loss",
+    "Error",
+]
+
+
+def read_watchlist(path):
+    """One symbol per line; blank lines and # comments are ignored"""
+    symbols = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            symbol = line.split("#", 1)[0].strip()
+            if symbol and symbol not in symbols:
+                symbols.append(symbol)
+    return symbols
+
+
+def longer_period(a, b):
+    """The longer of two yfinance style periods ("max" is the longest)"""
+    now = pd.Timestamp.now()
+    start_a, start_b = period_start(now, a), period_start(now, b)
+    if start_a is None or start_b is None:
+        return "max"
+    return a if start_a <= start_b else b
+
+
+def analyze_symbol(
+    symbol,
+    data,
+    days_ahead=30,
+    compact=False,
+    backend=DEFAULT_BACKEND,
+    trend_timeframe=None,
+    period=None,
+):
+    """
+    CPU-bound part of the pipeline for one symbol (runs in a worker process).
+    With `trend_timeframe` the trend comes from resampled bars (e.g. "1wk")
+    and `data` may hold more history than `period`; the forecast, RSI and
+    levels use the last `period` of the base bars.
+    """
+    trend_bars = None
+    if trend_timeframe is not None:
+        trend_bars = resample_bars(data, trend_timeframe)
+        trend_bars = calculate_moving_averages(trend_bars.copy())
+        if pd.isna(trend_bars["200MA"].iloc[-1]):
+            raise ValueError(
+                f"{len(trend_bars)} {trend_timeframe} bars, 200 needed for the trend"
+            )
+        start = period_start(data.index[-1], period)
+        if start is not None:
+            data = data[data.index >= start]
+    data = calculate_moving_averages(data)
+    data = calculate_RSI(data)
+    data = calculate_MACD(data, keep_emas=not compact)
+    trend = determin_trend(data if trend_bars is None else trend_bars)
+    # The process pool already uses every core, so fit each forest on one
+    predicted_price, _, _ = model_forecast(
+        data, days_ahead=days_ahead, n_jobs=1, backend=backend
+    )
+    entry_price, stop_loss = calculate_entry_stoploss(data, trend)
+    current_price = data["Close"].iloc[-1]
+    return {
+        "Symbol": symbol,
+        "Trend": trend,
+        "Last Date": data.index[-1].date(),
+        "Current Price": round(current_price, 2),
+        "Predicted Price": round(predicted_price, 2),
+        "Expected Return %": round(
+            (predicted_price - current_price) / current_price * 100, 2
+        ),
+        "RSI": round(data["RSI"].iloc[-1], 2),
+        "Entry Price": round(entry_price, 2) if entry_price else None,
+        "Stop Loss": round(stop_loss, 2) if stop_loss else None,
+        "Error": None,
+    }
+
+
+def run_screener(
+    symbols,
+    provider=None,
+    period="5y",
+    days_ahead=30,
+    io_workers=8,
+    cpu_workers=None,
+    compact=False,
+    backend=DEFAULT_BACKEND,
+    trend_timeframe=None,
+):
+    """Screen `symbols` and return a DataFrame ranked by expected return"""
+    fetch_period = period
+    if trend_timeframe is not None:
+        fetch_period = longer_period(period, history_period(trend_timeframe))
+    rows = []
+    total = len(symbols)
+
+    def report(row):
+        rows.append(row)
+        status = "failed: " + row["Error"] if row["Error"] else "ok"
+        print(f"[{len(rows)}/{total}] {row['Symbol']} {status}", flush=True)
+
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, ProcessPoolExecutor(
+        max_workers=cpu_workers
+    ) as cpu_pool:
+        fetches = {
+            io_pool.submit(
+                fetch_stock_data,
+                symbol,
+                period=fetch_period,
+                provider=provider,
+                compact=compact,
+            ): symbol
+            for symbol in symbols
+        }
+        analyses = {}
+        for future in as_completed(fetches):
+            symbol = fetches[future]
+            try:
+                data = future.result()
+                if len(data) == 0:
+                    raise ValueError("no price data")
+            except Exception as e:
+                report({"Symbol": symbol, "Error": f"fetch: {e}"})
+                continue
+            analyses[
+                cpu_pool.submit(
+                    analyze_symbol,
+                    symbol,
+                    data,
+                    days_ahead,
+                    compact,
+                    backend,
+                    trend_timeframe,
+                    period,
+                )
+            ] = symbol
+
+        for future in as_completed(analyses):
+            try:
+                report(future.result())
+            except Exception as e:
+                report({"Symbol": analyses[future], "Error": f"analysis: {e}"})
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    # Successful symbols first, best expected return on top
+    failed = results["Error"].notna()
+    results = results.loc[
+        pd.DataFrame({"failed": failed, "ret": results["Expected Return %"]})
+        .sort_values(["failed", "ret"], ascending=[True, False])
+        .index
+    ]
+    results = results.reset_index(drop=True)
+    results.index = results.index + 1
+    results.index.name = "Rank"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen a watchlist of stocks")
+    parser.add_argument("watchlist", help="text file with one symbol per line")
+    parser.add_argument("--output", default="screener_results.csv")
+    parser.add_argument("--provider", choices=["yahoo", "csv"], default=None)
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--days-ahead", type=int, default=30)
+    parser.add_argument("--io-workers", type=int, default=8)
+    parser.add_argument("--cpu-workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--compact", action="store_true", help="float32 price frames (less memory)"
+    )
+    parser.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument(
+        "--trend-timeframe",
+        choices=list(TIMEFRAMES),
+        default=None,
+        help="judge the trend on weekly / monthly bars (resampled locally; "
+        "fetches enough history for their 200-bar average)",
+    )
+    args = parser.parse_args()
+
+    symbols = read_watchlist(args.watchlist)
+    provider = get_provider(args.provider)
+    print(f"Screening {len(symbols)} symbols")
+
+    start = time.perf_counter()
+    results = run_screener(
+        symbols,
+        provider=provider,
+        period=args.period,
+        days_ahead=args.days_ahead,
+        io_workers=args.io_workers,
+        cpu_workers=args.cpu_workers,
+        compact=args.compact,
+        backend=args.backend,
+        trend_timeframe=args.trend_timeframe,
+    )
+    elapsed = time.perf_counter() - start
+
+    results.to_csv(args.output)
+    print(results.to_string())
+    failed = results["Error"].notna().sum()
+    print(f"\nSaved {len(results)} rows to {args.output} ({failed} failed)")
+    print(
+        f"Screened {len(symbols)} symbols in {elapsed:.1f}s "
+        f"({len(symbols) / elapsed:.2f} symbols/sec)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ import os
 import webbrowser
 import numpy as np
 
+from frame_export import export_frame
+from report_writer import write_csv, write_html_report
+
 symbol = "CIPLA.NS"
 stock = yf.Ticker(symbol)
 
@@ -34,40 +37,18 @@ else:
 print(f"Trend for {symbol}: {trend}")
 # ============================================
 
-data.to_csv("stock_data.csv")
+write_csv("stock_data.csv", data)
+export_frame(data, "stock_data.cols")
 print("Data saved...")
 
-# Convert DataFrame to HTML table and open in browser
-data_html = data.reset_index().to_html(index=True)
-
+# Write the table as an HTML page (streamed in chunks) and open in browser
 html_file = "stock_data.html"
-
-# === For better looking HTML file with Bootstrap CSS
-
-html_template = f"""
-<html>
-    <head>
-        <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css">
-          <style>
-            th {{
-                text-align: center;
-            }}
-            td {{
-                text-align: center;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h2>Last month Stock Data of {symbol}</h2>
-            <h4>Trend: {trend}</h4>            
-            {data.reset_index().to_html(classes="table table-striped table-bordered", index=False)}
-        </div>
-    </body>
-</html>
-"""
-
-with open(html_file, "w") as f:
-    f.write(html_template)
+write_html_report(
+    html_file,
+    data,
+    title=f"Last month Stock Data of {symbol}",
+    header_html=f"<h4>Trend: {trend}</h4>",
+    page_size=50,
+)
 
 webbrowser.open(f"file://{os.path.abspath(html_file)}")
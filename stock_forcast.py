@@ -1,27 +1,46 @@
-import yfinance as yf
-import pandas as pd
+import copy
 import numpy as np
 import os
-import webbrowser
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error
+
+from features import build_feature_matrix, parse_feature, split_point
+from frame_export import export_frame
+from instrumentation import stage
+from model_backends import BACKENDS, DEFAULT_BACKEND, get_backend, make_model
+from model_registry import get_registry
+from price_store import load_prices
+from report_writer import write_csv, write_html_report
+from rsi_kernel import rsi_kernel
+from streaming_indicators import IndicatorState
+from timeframes import get_bar_cache
 
 
 # =============== Data Fetching ===============
-def fetch_stock_data(symbol, period="5y"):
-    """Fetch historical stock data from Yahoo Finance"""
-    stock = yf.Ticker(symbol)
-    data = stock.history(period=period)
-    data = data.sort_index(ascending=True)
-    return data
+def fetch_stock_data(
+    symbol, period="5y", store=None, provider=None, compact=False, timeframe=None
+):
+    """
+    Fetch historical stock data. Bars are read from the local price store
+    and only the missing tail is downloaded (Yahoo Finance by default).
+    `compact=True` returns float32 prices without Dividends / Stock Splits.
+    `timeframe` ("1d", "1wk", "1mo") resamples the stored bars (cached).
+    """
+    with stage("fetch"):
+        data = load_prices(
+            symbol, period=period, store=store, provider=provider, compact=compact
+        )
+    if timeframe is None or len(data) == 0:
+        return data
+    with stage("resample"):
+        return get_bar_cache().resample(data, timeframe, symbol)
 
 
 # =============== Technical Indicators ===============
+# Indicator columns keep the dtype of Close (float32 for compact frames)
 def calculate_moving_averages(data):
-    data["50MA"] = data["Close"].rolling(window=50).mean()
-    data["200MA"] = data["Close"].rolling(window=200).mean()
+    dtype = data["Close"].dtype
+    data["50MA"] = data["Close"].rolling(window=50).mean().astype(dtype)
+    data["200MA"] = data["Close"].rolling(window=200).mean().astype(dtype)
     return data
 
 
@@ -41,22 +60,25 @@ def determin_trend(data):
     return trend
 
 
-def calculate_RSI(data, window=14):
-    delta = data["Close"].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=window).mean()
-    avg_loss = loss.rolling(window=window).mean()
-    rs = avg_gain / avg_loss
-    data["RSI"] = 100 - (100 / (1 + rs))
+def calculate_RSI(data, window=14, method="sma"):
+    """method="sma" averages gains / losses over `window`, "wilder" smooths them"""
+    rsi = rsi_kernel(data["Close"].to_numpy(), window, method)
+    data["RSI"] = rsi.astype(data["Close"].dtype, copy=False)
     return data
 
 
-def calculate_MACD(data, fast=12, slow=26, signal=9):
-    data["EMA_fast"] = data["Close"].ewm(span=fast, adjust=False).mean()
-    data["EMA_slow"] = data["Close"].ewm(span=slow, adjust=False).mean()
-    data["MACD"] = data["EMA_fast"] - data["EMA_slow"]
-    data["MACD_signal"] = data["MACD"].ewm(span=signal, adjust=False).mean()
+def calculate_MACD(data, fast=12, slow=26, signal=9, keep_emas=True):
+    """With keep_emas=False the fast/slow EMAs are temporaries, not columns"""
+    dtype = data["Close"].dtype
+    ema_fast = data["Close"].ewm(span=fast, adjust=False).mean()
+    ema_slow = data["Close"].ewm(span=slow, adjust=False).mean()
+    if keep_emas:
+        data["EMA_fast"] = ema_fast.astype(dtype)
+        data["EMA_slow"] = ema_slow.astype(dtype)
+    data["MACD"] = (ema_fast - ema_slow).astype(dtype)
+    data["MACD_signal"] = (
+        data["MACD"].ewm(span=signal, adjust=False).mean().astype(dtype)
+    )
     return data
 
 
@@ -67,45 +89,123 @@ historical stock indicators and predict stock prices for the next 30 days.
 """
 
 
-def random_forest_forecast(data, days_ahead=30):
+RF_PARAMS = BACKENDS["random_forest"]["params"]
+
+
+def train_model(X, y, backend=DEFAULT_BACKEND, n_jobs=-1):
     """
-    Predict future stock prices using Random Forest Regressor
+    Fit a model backend (see model_backends.py) on the first 80% of rows
+    and print the test MAE. Forests build their trees in parallel on
+    `n_jobs` cores; the fixed random_state keeps the result identical
+    whatever the core count.
     """
-    df = data.copy()
-    # next-day close as target
-    df["Target"] = df["Close"].shift(-1)
-    df = df.dropna()
-
-    # Features (you can add more indicators here)
-    features = ["Close", "50MA", "200MA", "RSI", "MACD", "MACD_signal"]
-    df = df.dropna()  # drop rows with NaN from indicators
-    X = df[features]
-    y = df["Target"]
-
-    # Train/test split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, shuffle=False
-    )
+    # Train/test split (views, no copies)
+    n_train = split_point(len(X))
+    X_train, X_test = X[:n_train], X[n_train:]
+    y_train, y_test = y[:n_train], y[n_train:]
 
     # Train model
-    model = RandomForestRegressor(n_estimators=200, random_state=42)
-    model.fit(X_train, y_train)
+    with stage("train.fit"):
+        model = make_model(backend, multi_output=y.ndim > 1, n_jobs=n_jobs)
+        model.fit(X_train, y_train)
+
+    # Evaluate (scikit-learn is imported on first use, see model_backends)
+    from sklearn.metrics import mean_absolute_error
 
-    # Evaluate
-    y_pred = model.predict(X_test)
-    mae = mean_absolute_error(y_test, y_pred)
-    print(f"Random Forest MAE: {mae:.2f}")
+    with stage("train.evaluate"):
+        y_pred = model.predict(X_test)
+        mae = mean_absolute_error(y_test, y_pred)
+    print(f"{get_backend(backend)['label']} MAE: {mae:.2f}")
+    return model
 
-    # Forecast future price iteratively
-    last_known = X.iloc[-1].values.reshape(1, -1)
-    forecast_prices = []
-    for _ in range(days_ahead):
-        pred = model.predict(last_known)[0]
-        forecast_prices.append(pred)
-        # update only Close for simplicity
-        last_known[0, 0] = pred
 
-    return forecast_prices[-1], forecast_prices
+def step_feature(row, closes, name):
+    """Feature value for a recursive forecast step (lags come from `closes`)"""
+    column, lag = parse_feature(name)
+    return closes[-1 - lag] if lag else row[column]
+
+
+def random_forest_forecast(data, days_ahead=30, method="recursive", **kwargs):
+    """
+    Predict future stock prices using Random Forest Regressor.
+    Returns (predicted_price, forecast_prices); see model_forecast() for the
+    keyword arguments and for the model source.
+    """
+    predicted_price, forecast_prices, _ = model_forecast(
+        data, days_ahead, method=method, **kwargs
+    )
+    return predicted_price, forecast_prices
+
+
+def model_forecast(
+    data,
+    days_ahead=30,
+    symbol=None,
+    registry=None,
+    service=None,
+    method="direct",
+    n_jobs=-1,
+    backend=DEFAULT_BACKEND,
+):
+    """
+    Forecast the next `days_ahead` closes with the model `backend` picks
+    (random_forest, tiny_forest, hist_gbm, ridge).
+
+    method="direct" trains one multi-output model whose outputs are the
+    closes 1..days_ahead bars ahead, so the whole path comes from a single
+    predict call. method="recursive" predicts one day at a time and feeds
+    each prediction back in, updating MA/RSI/MACD incrementally per step.
+
+    When a `symbol` and model `registry` are given, a cached model is reused
+    until new bars arrive. A training `service` moves fitting to its process
+    pool; otherwise the model is fitted here on `n_jobs` cores.
+    Returns (predicted_price, forecast_prices, source) where source is
+    "cached" or "trained".
+    """
+    # Feature matrix and targets, built once (see features.py)
+    features = get_backend(backend)["features"]
+    with stage("features"):
+        fm = build_feature_matrix(data, days_ahead, method, features=features)
+    X, y = fm.X_labeled, fm.y
+
+    if service is not None:
+        train = lambda: service.train(X, y, backend)
+    else:
+        train = lambda: train_model(X, y, backend, n_jobs=n_jobs)
+
+    model_params = dict(get_backend(backend)["params"], backend=backend, method=method)
+    if method == "direct":
+        model_params["horizon"] = days_ahead
+    with stage("train"):
+        if symbol is not None and registry is not None:
+            model, source = registry.get_or_train(
+                symbol, features, model_params, fm.index, train
+            )
+        else:
+            model, source = train(), "trained"
+
+    # Forecast from the latest bar
+    with stage("forecast"):
+        last_known = fm.last_row
+        if method == "direct":
+            forecast_prices = list(model.predict(last_known)[0])
+            return forecast_prices[-1], forecast_prices, source
+
+        # Single-row predicts are faster without the thread pool. The model
+        # may be shared through the registry, so change a shallow copy
+        if "n_jobs" in model.get_params():
+            model = copy.copy(model).set_params(n_jobs=1)
+        state = IndicatorState.from_history(data)
+        closes = list(data["Close"].iloc[-6:])
+        forecast_prices = []
+        for _ in range(days_ahead):
+            pred = model.predict(last_known)[0]
+            forecast_prices.append(pred)
+            row = state.update(pred)
+            closes.append(pred)
+            last_known = np.array([[step_feature(row, closes, f) for f in features]])
+
+    return forecast_prices[-1], forecast_prices, source
 
 
 # =============== Entry / Stoploss ===============
@@ -132,6 +232,7 @@ def generate_html_report(
     stop_loss=None,
     price_difference=None,
     profit_or_loss=None,
+    page_size=None,
 ):
     html_file = f"{symbol}_stock_data.html"
     current_price = data["Close"].iloc[-1]
@@ -145,33 +246,25 @@ def generate_html_report(
     )
     stop_info = f"Stop-Loss Level: {stop_loss:.2f}" if stop_loss else ""
 
-    table_html = data.reset_index().to_html(
-        classes="table table-striped table-bordered", index=False
+    header_html = f"""
+    <p><strong>Trend:</strong> {trend}</p>
+    <p><strong>Current Price:</strong> {current_price:.2f} on {last_date}</p>
+    <p><strong>Predicted Price (1 month):</strong> {predicted_price:.2f} on {future_date}</p>
+    <p><strong>Price Difference:</strong> {price_difference if price_difference else '-'}</p>
+    <p><strong>Profit or Loss:</strong> {profit_or_loss if profit_or_loss else '-'}</p>
+    <p>{entry_info}</p>
+    <p>{stop_info}</p>
+    """
+    # Header, rows and footer are streamed to the file (see report_writer.py)
+    write_html_report(
+        html_file,
+        data,
+        title=f"Last 30 Days Stock Data of {symbol}",
+        header_html=header_html,
+        page_size=page_size,
     )
+    import webbrowser
 
-    html_template = f"""
-    <html>
-        <head>
-            <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css">
-            <style>th, td {{text-align:center}} p{{margin:2px 0}}</style>
-        </head>
-        <body>
-            <div class="container my-3">
-                <h4>Last 30 Days Stock Data of {symbol}</h4>
-                <p><strong>Trend:</strong> {trend}</p>
-                <p><strong>Current Price:</strong> {current_price:.2f} on {last_date}</p>
-                <p><strong>Predicted Price (1 month):</strong> {predicted_price:.2f} on {future_date}</p>
-                <p><strong>Price Difference:</strong> {price_difference if price_difference else '-'}</p>
-                <p><strong>Profit or Loss:</strong> {profit_or_loss if profit_or_loss else '-'}</p>
-                <p>{entry_info}</p>
-                <p>{stop_info}</p>
-                {table_html}
-            </div>
-        </body>
-    </html>
-    """
-    with open(html_file, "w", encoding="utf-8") as f:
-        f.write(html_template)
     webbrowser.open(f"file://{os.path.abspath(html_file)}")
 
 
@@ -185,12 +278,16 @@ if __name__ == "__main__":
     data = calculate_MACD(data)
 
     # Random Forest Forecast
-    predicted_price, forecast_prices = random_forest_forecast(data, days_ahead=30)
+    predicted_price, forecast_prices, _ = model_forecast(
+        data, days_ahead=30, symbol=symbol, registry=get_registry()
+    )
 
     # Entry & Stoploss
     entry_price, stop_loss = calculate_entry_stoploss(data, trend)
 
-    data.to_csv(f"{symbol}_stock_data.csv")
+    write_csv(f"{symbol}_stock_data.csv", data)
+    # Binary copy for fast re-reads (see frame_export.py)
+    export_frame(data, f"{symbol}_stock_data.cols")
     last_30_days_data = data.tail(30)
     current_price = data["Close"].iloc[-1]
     price_difference = f"{predicted_price - current_price:.2f}"
@@ -1,238 +1,359 @@
-import yfinance as yf
+import hashlib
+import json
+import os
+import threading
+import time
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error
-from flask import Flask, request, render_template_string
+
+import pandas as pd
+from flask import (
+    Flask,
+    abort,
+    g,
+    has_request_context,
+    jsonify,
+    request,
+    render_template,
+    url_for,
+)
+
+from indicator_cache import get_indicator_cache
+from instrumentation import TRACE_ALLOCATIONS, add_hook, stage, trace_allocations
+from metrics import CONTENT_TYPE, get_stage_histogram, render_metrics
+from model_backends import BACKENDS, DEFAULT_BACKEND
+from model_registry import get_registry
+from prediction_jobs import JobQueue
+from price_store import is_valid_symbol
+from response_cache import TTLCache
+from stock_forcast import (
+    fetch_stock_data,
+    calculate_moving_averages,
+    determin_trend,
+    calculate_RSI,
+    calculate_MACD,
+    model_forecast,
+    calculate_entry_stoploss,
+)
+from training_service import get_service
 
 # Create a Flask application instance
 app = Flask(__name__)
 
+# Seconds a JSON prediction is served from cache before checking for new bars
+API_CACHE_TTL = int(os.environ.get("API_CACHE_TTL", "300"))
+# Keep price frames as float32 without unused columns (see price_store)
+COMPACT_FRAMES = os.environ.get("COMPACT_FRAMES", "0") == "1"
+
+STOCKS = {
+    "Reliance Industries": "RELIANCE.NS",
+    "Infosys": "INFY.NS",
+    "TCS": "TCS.NS",
+    "HDFC Bank": "HDFCBANK.NS",
+    "Ola Electric": "OLAELEC.NS",
+}
 
-# =============== Data Fetching ===============
-def fetch_stock_data(symbol, period="5y"):
-    """Fetch historical stock data from Yahoo Finance"""
-    stock = yf.Ticker(symbol)
-    data = stock.history(period=period)
-    data = data.sort_index(ascending=True)
-    return data
-
-
-# =============== Technical Indicators ===============
-def calculate_moving_averages(data):
-    data["50MA"] = data["Close"].rolling(window=50).mean()
-    data["200MA"] = data["Close"].rolling(window=200).mean()
-    return data
-
-
-def determin_trend(data):
-    if (
-        data["50MA"].iloc[-1] > data["200MA"].iloc[-1]
-        and data["Close"].iloc[-1] > data["50MA"].iloc[-1]
-    ):
-        trend = "UPTREND (bullish for next 1-3 months)"
-    elif (
-        data["50MA"].iloc[-1] < data["200MA"].iloc[-1]
-        and data["Close"].iloc[-1] < data["50MA"].iloc[-1]
-    ):
-        trend = "DOWNTREND (bearish for next 1-3 months)"
-    else:
-        trend = "SIDEWAYS (uncertain)"
-    return trend
-
-
-def calculate_RSI(data, window=14):
-    delta = data["Close"].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=window).mean()
-    avg_loss = loss.rolling(window=window).mean()
-    rs = avg_gain / avg_loss
-    data["RSI"] = 100 - (100 / (1 + rs))
-    return data
-
-
-def calculate_MACD(data, fast=12, slow=26, signal=9):
-    data["EMA_fast"] = data["Close"].ewm(span=fast, adjust=False).mean()
-    data["EMA_slow"] = data["Close"].ewm(span=slow, adjust=False).mean()
-    data["MACD"] = data["EMA_fast"] - data["EMA_slow"]
-    data["MACD_signal"] = data["MACD"].ewm(span=signal, adjust=False).mean()
-    return data
-
-
-# =============== Random Forest Forecast ===============
-"""
-This function uses a Random Forest ML model to learn from
-historical stock indicators and predict stock prices for the next 30 days.
-"""
-
-
-def random_forest_forecast(data, days_ahead=30):
+
+# =============== Prediction Pipeline ===============
+def run_prediction(symbol, data=None, backend=DEFAULT_BACKEND):
     """
-    Predict future stock prices using Random Forest Regressor
+    Fetch (unless `data` is given), analyse and forecast one symbol with
+    the given model backend. Returns (prediction, data); raises ValueError
+    when there are no bars for the symbol.
     """
-    df = data.copy()
-    # next-day close as target
-    df["Target"] = df["Close"].shift(-1)
-    # Drop last row with NaN target
-    df = df.dropna()
-    # Features (you can add more indicators here)
-    features = ["Close", "50MA", "200MA", "RSI", "MACD", "MACD_signal"]
-    # drop rows with NaN from indicators
-    df = df.dropna()
-    # Feature matrix and target vector
-    X = df[features]
-    y = df["Target"]
-
-    # Train/test split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, shuffle=False
+    if data is None:
+        data = fetch_stock_data(symbol, compact=COMPACT_FRAMES)
+    if len(data) == 0:
+        raise ValueError(f"no price data for {symbol}")
+    with stage("indicators"):
+        # Memoized per (symbol, series fingerprint), see indicator_cache.py
+        cache = get_indicator_cache()
+        data = cache.apply(calculate_moving_averages, data, symbol)
+        data = cache.apply(calculate_RSI, data, symbol)
+        data = cache.apply(calculate_MACD, data, symbol, keep_emas=not COMPACT_FRAMES)
+        trend = determin_trend(data)
+    # Random Forest Forecast
+    predicted_price, forecast_prices, model_source = model_forecast(
+        data,
+        symbol=symbol,
+        registry=get_registry(),
+        service=get_service(),
+        backend=backend,
     )
+    # Entry & Stoploss
+    entry_price, stop_loss = calculate_entry_stoploss(data, trend)
+    current_price = data["Close"].iloc[-1]
+
+    prediction = {
+        "symbol": symbol,
+        "trend": trend,
+        "current_price": float(current_price),
+        "predicted_price": float(predicted_price),
+        "price_difference": float(predicted_price - current_price),
+        "profit_or_loss": float(
+            (predicted_price - current_price) / current_price * 100
+        ),
+        "entry_price": float(entry_price) if entry_price else None,
+        "stop_loss": float(stop_loss) if stop_loss else None,
+        "forecast_prices": [float(price) for price in forecast_prices],
+        "date_now": data.index[-1].date(),
+        "future_date": datetime.now().date() + timedelta(days=30),
+        "model_source": model_source,
+        "backend": backend,
+    }
+    # A warm-up failure is cleared once the prediction succeeds
+    warmup_failures.pop(warmup_key(symbol, backend), None)
+    return prediction, data
 
-    # Train model
-    model = RandomForestRegressor(n_estimators=200, random_state=42)
-    model.fit(X_train, y_train)
-
-    # Evaluate
-    y_pred = model.predict(X_test)
-    mae = mean_absolute_error(y_test, y_pred)
-    print(f"Random Forest MAE: {mae:.2f}")
-
-    # Forecast future price iteratively
-    last_known = X.iloc[-1].values.reshape(1, -1)
-    forecast_prices = []
-    for _ in range(days_ahead):
-        pred = model.predict(last_known)[0]
-        forecast_prices.append(pred)
-        # update only Close for simplicity
-        last_known[0, 0] = pred
-
-    return forecast_prices[-1], forecast_prices
-
-
-# =============== Entry / Stoploss ===============
-def calculate_entry_stoploss(data, trend, stoploss_percent=5):
-    entry_price = None
-    stop_loss = None
-    if (
-        trend.startswith("UPTREND")
-        and data["RSI"].iloc[-1] < 70
-        and data["MACD"].iloc[-1] > data["MACD_signal"].iloc[-1]
-    ):
-        entry_price = data["Close"].iloc[-1]
-        stop_loss = entry_price * (1 - stoploss_percent / 100)
-    return entry_price, stop_loss
 
+def prediction_to_json(prediction):
+    """Same prediction with dates as ISO strings"""
+    return dict(
+        prediction,
+        date_now=prediction["date_now"].isoformat(),
+        future_date=prediction["future_date"].isoformat(),
+    )
 
-# =============== Flask Routes ===============
-@app.route("/", methods=["GET", "POST"])
-def index():
-    stocks = {
-        "Reliance Industries": "RELIANCE.NS",
-        "Infosys": "INFY.NS",
-        "TCS": "TCS.NS",
-        "HDFC Bank": "HDFCBANK.NS",
-        "Ola Electric": "OLAELEC.NS",
-    }
 
-    result = None
-    table_html = None
+def bar_version(data):
+    """
+    Last bar timestamp plus a hash of that bar's values, so a partial
+    intraday bar that the provider refreshes gets a new version
+    """
+    last = pd.util.hash_pandas_object(data.iloc[-1:], index=False).to_numpy()
+    return f"{data.index[-1].isoformat()}/{last[0]:016x}"
 
-    if request.method == "POST":
-        selected_symbol = request.form["symbol"]
-        data = fetch_stock_data(selected_symbol)
-        data = calculate_moving_averages(data)
-        data = calculate_RSI(data)
-        data = calculate_MACD(data)
-        trend = determin_trend(data)
-        # Random Forest Forecast
-        predicted_price, _ = random_forest_forecast(data)
-        # Entry & Stoploss
-        entry_price, stop_loss = calculate_entry_stoploss(data, trend)
-        current_price = data["Close"].iloc[-1]
-        price_difference = predicted_price - current_price
-        profit_or_loss = ((predicted_price - current_price) / current_price) * 100
 
+_job_queue = None
+_prediction_cache = TTLCache(ttl=API_CACHE_TTL)
+# Keyed by (symbol, bar_version) so entries never go stale; the TTL only bounds memory
+_table_cache = TTLCache(ttl=24 * 60 * 60, max_entries=256)
+
+
+def get_job_queue():
+    global _job_queue
+    if _job_queue is None:
+        # Jobs are keyed (and coalesced) by (symbol, backend)
+        _job_queue = JobQueue(
+            lambda key: prediction_to_json(run_prediction(key[0], backend=key[1])[0])
+        )
+    return _job_queue
+
+
+def render_table(symbol, data):
+    """Last 30 days as an HTML table, rendered once per (symbol, bar_version)"""
+    key = (symbol, bar_version(data))
+    table_html = _table_cache.get(key)
+    if table_html is None:
         table_html = (
             data.tail(30)
             .reset_index()
             .to_html(classes="table table-striped table-bordered", index=False)
         )
+        _table_cache.set(key, table_html)
+    return table_html
+
+
+# Set once the app has warmed up (see wsgi.py); /healthz reports 503 until
+# then, and afterwards while a warm-up request has failed and no later
+# prediction for that symbol and backend has succeeded
+ready = threading.Event()
+warmup_failures = {}  # warmup_key() -> HTTP status of the failed request
+
+
+def warmup_key(symbol, backend):
+    return f"{symbol} ({backend})"
+
+
+# =============== Instrumentation ===============
+stage_histogram = get_stage_histogram()
+
+
+@add_hook
+def record_request_stage(name, seconds, allocated):
+    """Collect the stages run while handling a request for Server-Timing"""
+    if has_request_context() and "stage_timings" in g:
+        g.stage_timings.append((name, seconds, allocated))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.stage_timings = []
+
+
+@app.after_request
+def add_server_timing(response):
+    if "request_start" not in g:
+        return response
+    total = time.perf_counter() - g.request_start
+    entries = []
+    for name, seconds, allocated in g.stage_timings:
+        entry = f"{name};dur={seconds * 1000:.1f}"
+        if allocated is not None:  # TRACE_ALLOCATIONS=1
+            entry += f';desc="{allocated} B"'
+        entries.append(entry)
+    entries.append(f"total;dur={total * 1000:.1f}")
+    response.headers["Server-Timing"] = ", ".join(entries)
+    return response
+
+
+def cache_samples():
+    registry = get_registry()
+    indicators = get_indicator_cache()
+    samples = []
+    for cache, hits, misses in [
+        ("prediction", _prediction_cache.hits, _prediction_cache.misses),
+        ("table", _table_cache.hits, _table_cache.misses),
+        ("model", registry.hits, registry.misses),
+        ("indicators", indicators.hits, indicators.misses),
+    ]:
+        samples.append(({"cache": cache, "result": "hit"}, hits))
+        samples.append(({"cache": cache, "result": "miss"}, misses))
+    return samples
+
+
+# =============== Flask Routes ===============
+@app.route("/", methods=["GET", "POST"])
+def index():
+    result = None
+    table_html = None
+
+    if request.method == "POST":
+        selected_symbol = request.form["symbol"]
+        if not is_valid_symbol(selected_symbol):
+            abort(400, f"Invalid symbol: {selected_symbol}")
+        backend = request.form.get("backend", DEFAULT_BACKEND)
+        if backend not in BACKENDS:
+            abort(400, f"Unknown model backend: {backend}")
+        data = fetch_stock_data(selected_symbol, compact=COMPACT_FRAMES)
+        if len(data) == 0:
+            abort(404, f"No price data for {selected_symbol}")
+        prediction, data = run_prediction(selected_symbol, data, backend)
+        entry_price = prediction["entry_price"]
+        stop_loss = prediction["stop_loss"]
+
+        with stage("render.table"):
+            table_html = render_table(selected_symbol, data)
 
         result = {
             "symbol": selected_symbol,
-            "trend": trend,
-            "current_price": f"{current_price:.2f}",
-            "predicted_price": f"{predicted_price:.2f}",
-            "price_difference": f"{price_difference:.2f}",
-            "profit_or_loss": f"{profit_or_loss:.2f}%",
+            "trend": prediction["trend"],
+            "current_price": f"{prediction['current_price']:.2f}",
+            "predicted_price": f"{prediction['predicted_price']:.2f}",
+            "price_difference": f"{prediction['price_difference']:.2f}",
+            "profit_or_loss": f"{prediction['profit_or_loss']:.2f}%",
             "entry_price": f"{entry_price:.2f}" if entry_price else "No Entry Signal",
             "stop_loss": f"{stop_loss:.2f}" if stop_loss else "-",
-            "date_now": data.index[-1].date(),
-            "future_date": datetime.now().date() + timedelta(days=30),
+            "date_now": prediction["date_now"],
+            "future_date": prediction["future_date"],
+            "model_source": prediction["model_source"],
+            "backend": backend,
         }
 
-    return render_template_string(
-        """
-        <html>
-            <head>
-                <title>Stock Predictor</title>
-                <link rel="stylesheet"
-                      href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css">
-                <style>
-                    body { padding: 30px; }
-                    th, td { text-align: center; }
-                    .result-card { margin-top: 40px; }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h3 class="text-center mb-4">Stock Prediction Dashboard</h3>
-                    <form method="POST" class="text-center mb-4">
-                        <div class="row justify-content-center">
-                            <div class="col-md-4">
-                                <select name="symbol" class="form-select">
-                                    {% for name, sym in stocks.items() %}
-                                        <option value="{{ sym }}"
-                                            {% if result and result.symbol == sym %}selected{% endif %}>
-                                            {{ name }} ({{ sym }})
-                                        </option>
-                                    {% endfor %}
-                                </select>
-                            </div>
-                            <div class="col-md-2">
-                                <button type="submit" class="btn btn-primary w-100">Predict</button>
-                            </div>
-                        </div>
-                    </form>
-
-                    {% if result %}
-                    <div class="card result-card shadow">
-                        <div class="card-body">
-                            <h5 class="card-title text-center">Report for {{ result.symbol }}</h5>
-                            <p><b>Trend:</b> {{ result.trend }}</p>
-                            <p><b>Current Price:</b> ₹{{ result.current_price }} ({{ result.date_now }})</p>
-                            <p><b>Predicted Price (Next 30 Days):</b> ₹{{ result.predicted_price }} ({{ result.future_date }})</p>
-                            <p><b>Price Difference:</b> ₹{{ result.price_difference }}</p>
-                            <p><b>Expected Return:</b> {{ result.profit_or_loss }}</p>
-                            <p><b>Entry Price:</b> {{ result.entry_price }}</p>
-                            <p><b>Stop Loss:</b> {{ result.stop_loss }}</p>
-                        </div>
-                    </div>
-
-                    <div class="mt-4">
-                        <h5>Last 30 Days Data</h5>
-                        {{ table_html | safe }}
-                    </div>
-                    {% endif %}
-                </div>
-            </body>
-        </html>
-    """,
-        stocks=stocks,
-        result=result,
-        table_html=table_html,
-    )
+    with stage("render"):
+        return render_template(
+            "index.html",
+            stocks=STOCKS,
+            backends=BACKENDS,
+            result=result,
+            table_html=table_html,
+        )
+
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    """Queue a prediction; returns the job id to poll at GET /jobs/<id>"""
+    payload = request.get_json(silent=True) or request.form
+    symbol = payload.get("symbol")
+    backend = payload.get("backend", DEFAULT_BACKEND)
+    if not symbol:
+        return jsonify({"error": "symbol is required"}), 400
+    if not is_valid_symbol(symbol):
+        return jsonify({"error": f"invalid symbol: {symbol}"}), 400
+    if backend not in BACKENDS:
+        return jsonify({"error": f"unknown model backend: {backend}"}), 400
+    job = get_job_queue().submit((symbol, backend))
+    location = url_for("job_status", job_id=job["id"])
+    return jsonify(job), 202, {"Location": location}
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job)
+
+
+@app.route("/api/v1/predict/<symbol>")
+def api_predict(symbol):
+    """
+    JSON prediction for `symbol` (model picked with ?backend=). Responses
+    are cached for API_CACHE_TTL seconds; after that the prediction is only
+    recomputed when a new bar has arrived or the last bar has changed.
+    Supports ETag / If-None-Match.
+    """
+    if not is_valid_symbol(symbol):
+        return jsonify({"error": f"invalid symbol: {symbol}"}), 400
+    backend = request.args.get("backend", DEFAULT_BACKEND)
+    if backend not in BACKENDS:
+        return jsonify({"error": f"unknown model backend: {backend}"}), 400
+    key = (symbol, backend)
+    entry = _prediction_cache.get(key)
+    if entry is None:
+        data = fetch_stock_data(symbol, compact=COMPACT_FRAMES)
+        if len(data) == 0:
+            return jsonify({"error": f"no price data for {symbol}"}), 404
+        last_bar = data.index[-1].isoformat()
+        version = bar_version(data)
+        entry = _prediction_cache.get_stale(key)
+        if entry is None or entry["version"] != version:
+            prediction, _ = run_prediction(symbol, data, backend)
+            with stage("render"):
+                payload = dict(prediction_to_json(prediction), last_bar=last_bar)
+                body = json.dumps(payload, sort_keys=True)
+                etag = hashlib.sha1(body.encode("utf-8")).hexdigest()
+            entry = {"version": version, "body": body, "etag": etag}
+        _prediction_cache.set(key, entry)
+
+    response = app.response_class(entry["body"], mimetype="application/json")
+    response.set_etag(entry["etag"])
+    response.cache_control.public = True
+    response.cache_control.max_age = int(_prediction_cache.expires_in(key))
+    return response.make_conditional(request)
+
+
+@app.route("/metrics")
+def metrics():
+    """Stage latencies and cache / training counters in Prometheus format"""
+    registry = get_registry()
+    counters = [
+        (
+            "stock_cache_requests_total",
+            "Cache lookups by cache and result",
+            cache_samples(),
+        ),
+        (
+            "stock_models_trained_total",
+            "Models trained by backend",
+            [
+                ({"backend": backend}, count)
+                for backend, count in sorted(registry.trained.items())
+            ],
+        ),
+    ]
+    body = render_metrics(stage_histogram, counters)
+    return app.response_class(body, mimetype=None, content_type=CONTENT_TYPE)
+
+
+@app.route("/healthz")
+def healthz():
+    """Readiness probe: 200 once warm-up has succeeded, 503 otherwise"""
+    if not ready.is_set():
+        return jsonify({"status": "warming up"}), 503
+    if warmup_failures:
+        return jsonify({"status": "warm-up failed", "failed": warmup_failures}), 503
+    return jsonify({"status": "ready"})
 
 
 # Run the app in debug mode
@@ -240,5 +361,9 @@ if __name__ == "__main__":
     # Run on local host
     # app.run(debug=True)
 
+    # Development server only; see wsgi.py for production serving
+    if TRACE_ALLOCATIONS:
+        trace_allocations()
+    ready.set()
     # Run using public IP
     app.run(host="0.0.0.0", port=5000, debug=True)
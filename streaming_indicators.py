@@ -0,0 +1,227 @@
+"""
+Incremental (streaming) indicators.
+
+Each indicator keeps just enough state to absorb one new bar in constant
+time: running sums over fixed windows for the 50/200 MA and RSI, and the
+carried EMA values for MACD and its signal line. `IndicatorState` bundles
+them, can be snapshotted to a JSON file and hands `determin_trend` /
+`calculate_entry_stoploss` a one-row frame instead of the full history.
+
+tests/test_streaming_indicators.py compares every update against the
+pandas functions on the bundled CSV files.
+"""
+
+import json
+import math
+from collections import deque
+
+import pandas as pd
+
+
+# =============== Building Blocks ===============
+class RollingMean:
+    """Mean of the last `window` values using a running sum"""
+
+    def __init__(self, window, values=(), total=0.0, updates=0):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self.total = total
+        self.updates = updates
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self.updates += 1
+        # Re-sum now and then so floating point error can't build up
+        if self.updates % self.window == 0:
+            self.total = math.fsum(self.values)
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window:
+            return math.nan
+        return self.total / self.window
+
+    def to_dict(self):
+        return {
+            "window": self.window,
+            "values": list(self.values),
+            "total": self.total,
+            "updates": self.updates,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+class EMA:
+    """Exponential moving average, same recursion as pandas `ewm(adjust=False)`"""
+
+    def __init__(self, span, value=None):
+        self.span = span
+        self.value = math.nan if value is None else value
+
+    def update(self, x):
+        alpha = 2.0 / (self.span + 1.0)
+        decay = 1.0 - alpha
+        if math.isnan(self.value):
+            self.value = x
+        elif self.value != x:
+            self.value = (decay * self.value + alpha * x) / (decay + alpha)
+        return self.value
+
+    def to_dict(self):
+        return {"span": self.span, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+class RSI:
+    """Simple-average RSI over `window` closes (same formula as `calculate_RSI`)"""
+
+    def __init__(self, window=14, prev_close=None, gains=None, losses=None):
+        self.window = window
+        self.prev_close = prev_close
+        self.gains = RollingMean.from_dict(gains) if gains else RollingMean(window)
+        self.losses = RollingMean.from_dict(losses) if losses else RollingMean(window)
+
+    def update(self, close):
+        # The first bar has no delta; pandas counts it as zero gain and loss
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        self.gains.update(delta if delta > 0 else 0.0)
+        self.losses.update(-delta if delta < 0 else 0.0)
+        return self.value
+
+    @property
+    def value(self):
+        avg_gain, avg_loss = self.gains.value, self.losses.value
+        if math.isnan(avg_gain) or math.isnan(avg_loss):
+            return math.nan
+        if avg_loss == 0:
+            return math.nan if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def to_dict(self):
+        return {
+            "window": self.window,
+            "prev_close": self.prev_close,
+            "gains": self.gains.to_dict(),
+            "losses": self.losses.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+class MACD:
+    """MACD line and signal line from carried EMA state"""
+
+    def __init__(self, fast=12, slow=26, signal=9, state=None):
+        state = state or {}
+        self.ema_fast = EMA.from_dict(state["ema_fast"]) if state else EMA(fast)
+        self.ema_slow = EMA.from_dict(state["ema_slow"]) if state else EMA(slow)
+        self.ema_signal = EMA.from_dict(state["ema_signal"]) if state else EMA(signal)
+
+    def update(self, close):
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        self.ema_signal.update(macd)
+        return macd, self.ema_signal.value
+
+    @property
+    def value(self):
+        return self.ema_fast.value - self.ema_slow.value
+
+    def to_dict(self):
+        return {
+            "ema_fast": self.ema_fast.to_dict(),
+            "ema_slow": self.ema_slow.to_dict(),
+            "ema_signal": self.ema_signal.to_dict(),
+        }
+
+
+# =============== Indicator State ===============
+class IndicatorState:
+    """All indicators used by the pipeline, updated one bar at a time"""
+
+    def __init__(self, rsi_window=14, fast=12, slow=26, signal=9):
+        self.ma50 = RollingMean(50)
+        self.ma200 = RollingMean(200)
+        self.rsi = RSI(rsi_window)
+        self.macd = MACD(fast, slow, signal)
+        self.last_date = None
+        self.last_close = math.nan
+
+    @classmethod
+    def from_history(cls, data, **kwargs):
+        """Seed the state by replaying the Close column of `data` once"""
+        state = cls(**kwargs)
+        for date, close in data["Close"].items():
+            state.update(close, date)
+        return state
+
+    def update(self, close, date=None):
+        """Absorb one new bar in O(1) and return the latest indicator row"""
+        close = float(close)
+        self.ma50.update(close)
+        self.ma200.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.last_close = close
+        self.last_date = date
+        return self.latest()
+
+    def latest(self):
+        return {
+            "Close": self.last_close,
+            "50MA": self.ma50.value,
+            "200MA": self.ma200.value,
+            "RSI": self.rsi.value,
+            "EMA_fast": self.macd.ema_fast.value,
+            "EMA_slow": self.macd.ema_slow.value,
+            "MACD": self.macd.value,
+            "MACD_signal": self.macd.ema_signal.value,
+        }
+
+    def latest_frame(self):
+        """One-row DataFrame accepted by `determin_trend` and `calculate_entry_stoploss`"""
+        index = pd.DatetimeIndex([self.last_date], name="Date")
+        return pd.DataFrame([self.latest()], index=index)
+
+    # =============== Snapshots ===============
+    def to_dict(self):
+        return {
+            "ma50": self.ma50.to_dict(),
+            "ma200": self.ma200.to_dict(),
+            "rsi": self.rsi.to_dict(),
+            "macd": self.macd.to_dict(),
+            "last_date": None if self.last_date is None else str(self.last_date),
+            "last_close": self.last_close,
+        }
+
+    @classmethod
+    def from_dict(cls, saved):
+        state = cls()
+        state.ma50 = RollingMean.from_dict(saved["ma50"])
+        state.ma200 = RollingMean.from_dict(saved["ma200"])
+        state.rsi = RSI.from_dict(saved["rsi"])
+        state.macd = MACD(state=saved["macd"])
+        state.last_date = saved["last_date"] and pd.Timestamp(saved["last_date"])
+        state.last_close = saved["last_close"]
+        return state
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
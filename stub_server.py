@@ -0,0 +1,114 @@
+"""
+Local stub of the jsonplaceholder posts API, for offline runs of api_call.py.
+
+Serves /posts (all posts, or one page with ?_page=&_limit=) and /posts/<id>
+over HTTP/1.1 keep-alive on a background thread. `latency` adds a delay to
+every response and `fail_every` answers every n-th request with a 503, to
+exercise retries.
+
+    with StubServer(n_posts=5000, latency=0.02) as server:
+        Fetcher().fetch_pages(server.url + "/posts")
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_posts(n_posts):
+    return [
+        {
+            "userId": i // 10 + 1,
+            "id": i + 1,
+            "title": f"post {i + 1}",
+            "body": "lorem ipsum dolor sit amet " * 4,
+        }
+        for i in range(n_posts)
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            count = server.requests
+        if server.latency:
+            time.sleep(server.latency)
+        if server.fail_every and count % server.fail_every == 0:
+            return self.send_json(503, {"error": "try again"})
+
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts[0] != "posts" or len(parts) > 2:
+            return self.send_json(404, {"error": "not found"})
+        if len(parts) == 2:
+            post_id = int(parts[1]) if parts[1].isdigit() else 0
+            if not 1 <= post_id <= len(server.posts):
+                return self.send_json(404, {"error": "not found"})
+            return self.send_json(200, server.posts[post_id - 1])
+
+        query = parse_qs(url.query)
+        posts = server.posts
+        if "_page" in query:
+            limit = int(query.get("_limit", ["10"])[0])
+            start = (int(query["_page"][0]) - 1) * limit
+            posts = posts[start : start + limit]
+        self.send_json(200, posts)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer:
+    def __init__(self, n_posts=100, latency=0.0, fail_every=0, port=0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.posts = make_posts(n_posts)
+        self.httpd.latency = latency
+        self.httpd.fail_every = fail_every
+        self.httpd.requests = 0
+        self.httpd.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = StubServer(n_posts=1000, port=8000)
+    print(f"Serving stub posts API on {server.url}/posts")
+    server.httpd.serve_forever()
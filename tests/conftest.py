@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from price_store import CsvProvider
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYMBOLS = ["TATAMOTORS.NS", "OLAELEC.NS"]
+
+
+@pytest.fixture(scope="session")
+def provider():
+    """Offline provider serving the bundled <symbol>_stock_data.csv files"""
+    return CsvProvider(ROOT)
+
+
+@pytest.fixture
+def frames(provider):
+    """{symbol: price frame}; OLAELEC lists later, so it has leading NaNs in a panel"""
+    return {symbol: provider.history(symbol) for symbol in SYMBOLS}
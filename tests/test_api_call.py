@@ -0,0 +1,105 @@
+import json
+import time
+
+import pytest
+import requests
+
+from api_call import Fetcher, iter_json_records
+from stub_server import StubServer, make_posts
+
+
+def chunked(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+# =============== Streaming JSON ===============
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 100_000])
+def test_records_split_across_chunks(size):
+    records = make_posts(20) + [1500.25, -3, "a, ]b", [1, [2]], {"x": None}, True]
+    text = json.dumps(records, indent=1)
+    assert list(iter_json_records(chunked(text, size))) == records
+
+
+def test_number_is_not_cut_at_a_chunk_boundary():
+    assert list(iter_json_records(["[1500", ".5, 2", "0]"])) == [1500.5, 20]
+
+
+@pytest.mark.parametrize("text, expected", [("[]", []), (" [ ] ", []), ("{}", [{}])])
+def test_empty_and_non_array_documents(text, expected):
+    assert list(iter_json_records(chunked(text, 1))) == expected
+
+
+def test_single_object_is_one_record():
+    post = make_posts(1)[0]
+    assert list(iter_json_records(chunked(json.dumps(post), 5))) == [post]
+
+
+@pytest.mark.parametrize("text", ['[{"id": 1}, {"id": 2', '[{"id": 1}, {"id": }]'])
+def test_truncated_or_invalid_document_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(chunked(text, 4)))
+
+
+# =============== Fetcher against the stub server ===============
+@pytest.fixture
+def fetcher():
+    with Fetcher(max_workers=4, retries=2, backoff=0, timeout=5, batch_size=7) as f:
+        yield f
+
+
+def test_fetch_frame_streams_in_batches(fetcher):
+    with StubServer(n_posts=50) as server:
+        frames = list(fetcher.iter_frames(server.url + "/posts"))
+    assert [len(frame) for frame in frames] == [7] * 7 + [1]
+    ids = [i for frame in frames for i in frame["id"]]
+    assert ids == list(range(1, 51))
+
+
+def test_fetch_pages_stops_at_the_short_page(fetcher):
+    with StubServer(n_posts=95) as server:
+        frame = fetcher.fetch_pages(server.url + "/posts", limit=10)
+    assert frame["id"].tolist() == list(range(1, 96))
+
+
+def test_fetch_many_keeps_the_order(fetcher):
+    with StubServer(n_posts=30) as server:
+        urls = [f"{server.url}/posts/{i}" for i in (30, 1, 17)]
+        frames = fetcher.fetch_many(urls)
+    assert [frame["id"].iloc[0] for frame in frames] == [30, 1, 17]
+
+
+def test_server_errors_are_retried(fetcher):
+    with StubServer(n_posts=5, fail_every=2) as server:
+        first = fetcher.get_json(server.url + "/posts/1")
+        # The 2nd request gets a 503 and is retried as the 3rd
+        second = fetcher.get_json(server.url + "/posts/2")
+        assert server.requests == 3
+    assert (first["id"], second["id"]) == (1, 2)
+
+
+def test_retries_back_off_then_give_up():
+    with StubServer(fail_every=1) as server:
+        with Fetcher(retries=2, backoff=0.1) as fetcher:
+            start = time.perf_counter()
+            with pytest.raises(requests.RequestException):
+                fetcher.get_json(server.url + "/posts/1")
+            elapsed = time.perf_counter() - start
+        assert server.requests == 3
+    # urllib3 retries the first failure at once, then waits backoff * 2
+    assert elapsed >= 0.2
+
+
+def test_client_errors_are_not_retried(fetcher):
+    with StubServer(n_posts=5) as server:
+        with pytest.raises(requests.HTTPError) as info:
+            fetcher.get_json(server.url + "/posts/99")
+        assert server.requests == 1
+    assert info.value.response.status_code == 404
+
+
+def test_connection_refused_raises(fetcher):
+    server = StubServer()
+    url = server.url  # bound but never served, then closed
+    server.httpd.server_close()
+    with pytest.raises(requests.ConnectionError):
+        fetcher.get_json(url + "/posts")
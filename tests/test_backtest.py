@@ -0,0 +1,41 @@
+import numpy as np
+
+from backtest import DOWNTREND, SIDEWAYS, UPTREND, backtest, simulate, synthetic_panel
+
+
+def test_position_is_held_through_a_gap():
+    close = np.array([[10.0], [np.nan], [10.5], [9.0]])
+    # trend_codes reads a gap as SIDEWAYS
+    trend = np.array([[UPTREND], [SIDEWAYS], [UPTREND], [DOWNTREND]])
+    entries = np.array([[True], [False], [False], [False]])
+    positions, trades = simulate(close, trend, entries)
+    assert positions[:, 0].tolist() == [True, True, True, False]
+    assert len(trades) == 1
+    trade = trades.iloc[0]
+    assert (trade["entry_index"], trade["exit_index"]) == (0, 3)
+    assert trade["return"] == 9.0 / 10.0 - 1
+    assert trade["stopped"]
+
+
+def test_open_position_is_marked_to_the_last_close():
+    close = np.array([[10.0], [11.0], [np.nan]])
+    trend = np.full((3, 1), UPTREND)
+    entries = np.array([[True], [False], [False]])
+    _, trades = simulate(close, trend, entries)
+    assert trades["open"].tolist() == [True]
+    assert trades["exit"].tolist() == [11.0]
+
+
+def test_gapped_symbol_keeps_the_stats_finite():
+    close = synthetic_panel(2, n_dates=1250)
+    _, trades = backtest(close)
+    held = trades[
+        (trades["symbol"] == "0") & (trades["exit_index"] - trades["entry_index"] > 3)
+    ]
+    assert len(held)
+    for entry in held["entry_index"]:
+        close[entry + 1 : entry + 3, 0] = np.nan
+
+    report, trades = backtest(close)
+    assert trades["return"].notna().all()
+    assert np.isfinite(report.drop(columns="trades").to_numpy(dtype=float)).all()
@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+
+import price_store
+import stock_forcast_by_flask as web
+from response_cache import TTLCache
+from stock_forcast_by_flask import app
+
+ROOT = os.path.dirname(os.path.abspath(price_store.__file__))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client reading the bundled CSV files into an empty store"""
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(price_store, "DEFAULT_PROVIDER", "csv")
+    monkeypatch.setattr(
+        price_store, "_default_store", price_store.PriceStore(str(tmp_path))
+    )
+    return app.test_client()
+
+
+def wait(client, location, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(location).get_json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"{location} did not finish")
+
+
+@pytest.mark.parametrize("symbol", ["../../tmp/x", "..", "a b"])
+def test_invalid_symbols_are_rejected(client, symbol, tmp_path):
+    assert client.post("/", data={"symbol": symbol}).status_code == 400
+    assert client.post("/jobs", json={"symbol": symbol}).status_code == 400
+    assert client.get(f"/api/v1/predict/{symbol}").status_code in (400, 404)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_job_needs_a_symbol(client):
+    assert client.post("/jobs", json={}).status_code == 400
+    assert client.post("/jobs", json={"symbol": ""}).status_code == 400
+    response = client.post("/jobs", json={"symbol": "TCS.NS", "backend": "x"})
+    assert response.status_code == 400
+
+
+def test_unknown_symbol_is_not_found(client):
+    assert client.post("/", data={"symbol": "NOSUCH.NS"}).status_code == 404
+    assert client.get("/api/v1/predict/NOSUCH.NS").status_code == 404
+
+
+def test_job_for_unknown_symbol_fails_clearly(client):
+    response = client.post("/jobs", json={"symbol": "NOSUCH.NS"})
+    assert response.status_code == 202
+    job = wait(client, response.headers["Location"])
+    assert job["status"] == "failed"
+    assert job["error"] == "no price data for NOSUCH.NS"
+
+
+def test_unknown_job_id(client):
+    assert client.get("/jobs/0123").status_code == 404
+
+
+@pytest.fixture
+def refreshed(provider, monkeypatch):
+    """
+    Serves TATAMOTORS.NS, whose last bar is revised once `refreshed.revise`
+    is set; no model is trained
+    """
+    data = provider.history("TATAMOTORS.NS")
+    revised = data.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] += 5
+    revised.iloc[-1, revised.columns.get_loc("Volume")] += 1000
+
+    def fetch(symbol, compact=False):
+        return (revised if refreshed.revise else data).copy()
+
+    refreshed.revise = False
+    monkeypatch.setattr(web, "fetch_stock_data", fetch)
+    monkeypatch.setattr(
+        web,
+        "model_forecast",
+        lambda data, **kwargs: (data["Close"].iloc[-1], [], "test"),
+    )
+    monkeypatch.setattr(web, "_prediction_cache", TTLCache(ttl=0))
+    monkeypatch.setattr(web, "_table_cache", TTLCache(ttl=60))
+    return refreshed
+
+
+def test_revised_last_bar_is_not_served_from_cache(refreshed):
+    client = web.app.test_client()
+    first = client.get("/api/v1/predict/TATAMOTORS.NS")
+    again = client.get(
+        "/api/v1/predict/TATAMOTORS.NS", headers={"If-None-Match": first.get_etag()[0]}
+    )
+    assert again.status_code == 304
+
+    refreshed.revise = True
+    revised = client.get(
+        "/api/v1/predict/TATAMOTORS.NS", headers={"If-None-Match": first.get_etag()[0]}
+    )
+    assert revised.status_code == 200
+    price = revised.get_json()["current_price"]
+    assert price == first.get_json()["current_price"] + 5
+    assert revised.get_json()["last_bar"] == first.get_json()["last_bar"]
+
+
+def test_revised_last_bar_renders_a_new_table(refreshed):
+    data = web.fetch_stock_data("TATAMOTORS.NS")
+    table = web.render_table("TATAMOTORS.NS", data)
+    assert web.render_table("TATAMOTORS.NS", data.copy()) is table
+    refreshed.revise = True
+    revised = web.render_table("TATAMOTORS.NS", web.fetch_stock_data("TATAMOTORS.NS"))
+    assert revised != table
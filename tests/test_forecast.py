@@ -0,0 +1,64 @@
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from model_registry import ModelRegistry
+from stock_forcast import (
+    calculate_MACD,
+    calculate_moving_averages,
+    calculate_RSI,
+    model_forecast,
+    random_forest_forecast,
+)
+
+SYMBOL = "TATAMOTORS.NS"
+
+
+@pytest.fixture
+def data(provider):
+    return calculate_MACD(
+        calculate_RSI(calculate_moving_averages(provider.history(SYMBOL)))
+    )
+
+
+def quiet(fn, *args, **kwargs):
+    """train_model prints the test MAE on every fit"""
+    with redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def test_random_forest_forecast_keeps_its_return_shape(data):
+    predicted, prices = quiet(
+        random_forest_forecast, data, days_ahead=5, backend="tiny_forest"
+    )
+    assert len(prices) == 5
+    assert predicted == prices[-1]
+    # Still the recursive forecast by default
+    assert (predicted, prices) == quiet(
+        model_forecast, data, 5, method="recursive", backend="tiny_forest"
+    )[:2]
+
+
+@pytest.mark.parametrize("method", ["direct", "recursive"])
+def test_model_forecast_reports_the_model_source(data, tmp_path, method):
+    registry = ModelRegistry(str(tmp_path))
+    kwargs = dict(
+        symbol=SYMBOL, registry=registry, method=method, backend="tiny_forest"
+    )
+    first = quiet(model_forecast, data, 5, **kwargs)
+    second = quiet(model_forecast, data, 5, **kwargs)
+    assert (first[2], second[2]) == ("trained", "cached")
+    assert first[:2] == second[:2]
+
+
+def test_cached_model_is_not_changed(data, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    kwargs = dict(
+        symbol=SYMBOL, registry=registry, method="recursive", backend="tiny_forest"
+    )
+    quiet(model_forecast, data, 5, **kwargs)
+    (entry,) = registry._entries.values()
+    assert entry["model"].n_jobs == -1
+    quiet(model_forecast, data, 5, **kwargs)
+    assert entry["model"].n_jobs == -1
@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from frame_export import (
+    available_formats,
+    binary_path,
+    export_frame,
+    import_csv,
+    import_frame,
+    read_columns,
+)
+
+
+@pytest.fixture
+def data():
+    index = pd.date_range(
+        "2024-01-01 09:15", periods=5, freq="D", tz="Asia/Kolkata", name="Date"
+    )
+    return pd.DataFrame(
+        {
+            "Close": np.array([1.5, 2.25, np.nan, 4.0, 5.125], dtype=np.float32),
+            "Volume": np.arange(5, dtype=np.int64),
+            "Trend": np.array(["UP", None, "DOWN", np.nan, ""], dtype=object),
+        },
+        index=index,
+    )
+
+
+@pytest.mark.parametrize("fmt", ["cols", "parquet", "feather"])
+def test_round_trip(data, tmp_path, fmt):
+    if fmt not in available_formats():
+        pytest.skip(f"{fmt} needs pyarrow")
+    path = export_frame(data, str(tmp_path / f"frame.{fmt}"))
+    back = import_frame(path)
+    pd.testing.assert_index_equal(back.index, data.index, exact=False)
+    assert back["Close"].dtype == np.float32
+    np.testing.assert_array_equal(back["Close"], data["Close"])
+    np.testing.assert_array_equal(back["Volume"], data["Volume"])
+    # Missing strings stay missing; "" stays a string
+    assert back["Trend"].isna().tolist() == [False, True, False, True, False]
+    assert back["Trend"].iloc[[0, 2, 4]].tolist() == ["UP", "DOWN", ""]
+
+
+def test_columns_are_memory_mapped(data, tmp_path):
+    path = export_frame(data, str(tmp_path / "frame.cols"))
+    index, columns = read_columns(path)
+    assert isinstance(columns["Close"], np.memmap)
+    assert index.equals(data.index)
+    assert columns["Trend"].tolist() == ["UP", "", "DOWN", "", ""]
+
+
+def test_import_csv_writes_and_reuses_a_binary_copy(provider, tmp_path):
+    csv_path = str(tmp_path / "TATAMOTORS.NS_stock_data.csv")
+    shutil.copy(os.path.join(provider.folder, os.path.basename(csv_path)), csv_path)
+    first = import_csv(csv_path)
+    assert os.path.exists(os.path.join(binary_path(csv_path), "meta.json"))
+    second = import_csv(csv_path)
+    pd.testing.assert_frame_equal(second, first, check_index_type=False)
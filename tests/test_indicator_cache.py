@@ -0,0 +1,101 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from indicator_cache import IndicatorCache, fingerprint
+from stock_forcast import calculate_MACD, calculate_moving_averages, calculate_RSI
+
+
+def indicators(cache, data, symbol):
+    data = cache.apply(calculate_moving_averages, data, symbol)
+    data = cache.apply(calculate_RSI, data, symbol)
+    return cache.apply(calculate_MACD, data, symbol)
+
+
+@pytest.fixture
+def data(provider):
+    return provider.history("TATAMOTORS.NS")
+
+
+@pytest.fixture
+def expected(data):
+    return calculate_MACD(calculate_RSI(calculate_moving_averages(data.copy())))
+
+
+def test_hits_return_the_computed_columns(data, expected):
+    cache = IndicatorCache()
+    pd.testing.assert_frame_equal(
+        indicators(cache, data.copy(), "TATAMOTORS.NS"), expected
+    )
+    pd.testing.assert_frame_equal(
+        indicators(cache, data.copy(), "TATAMOTORS.NS"), expected
+    )
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_cached_columns_are_not_shared_with_callers(data, expected):
+    cache = IndicatorCache()
+    first = indicators(cache, data.copy(), "TATAMOTORS.NS")
+    first["RSI"] = 0.0
+    again = indicators(cache, data.copy(), "TATAMOTORS.NS")
+    pd.testing.assert_series_equal(again["RSI"], expected["RSI"])
+
+
+def test_revised_last_bar_changes_the_fingerprint(data):
+    changed = data.copy()
+    changed.iloc[-1, changed.columns.get_loc("Close")] += 1.0
+    assert fingerprint(changed, "TATAMOTORS.NS") != fingerprint(data, "TATAMOTORS.NS")
+    assert fingerprint(data, "OLAELEC.NS") != fingerprint(data, "TATAMOTORS.NS")
+
+    cache = IndicatorCache()
+    indicators(cache, data.copy(), "TATAMOTORS.NS")
+    result = indicators(cache, changed, "TATAMOTORS.NS")
+    assert cache.misses == 6
+    pd.testing.assert_frame_equal(
+        result,
+        calculate_MACD(calculate_RSI(calculate_moving_averages(changed.copy()))),
+    )
+
+
+def test_evicted_results_spill_to_disk_and_come_back(
+    provider, data, expected, tmp_path
+):
+    # Room for about one symbol's results, so the second symbol evicts the first
+    cache = IndicatorCache(max_bytes=80_000, spill_dir=str(tmp_path))
+    indicators(cache, data.copy(), "TATAMOTORS.NS")
+    indicators(cache, provider.history("OLAELEC.NS"), "OLAELEC.NS")
+    assert cache.spills > 0 and cache.nbytes <= 80_000
+
+    result = indicators(cache, data.copy(), "TATAMOTORS.NS")
+    assert cache.disk_hits > 0
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_entry_limit_evicts_least_recently_used(data):
+    cache = IndicatorCache(max_entries=2)
+    for symbol in ["A", "B", "C"]:
+        cache.apply(calculate_RSI, data.copy(), symbol)
+    assert len(cache) == 2
+    cache.apply(calculate_RSI, data.copy(), "A")
+    assert cache.misses == 4
+
+
+def test_concurrent_misses_count_the_bytes_once(data):
+    cache = IndicatorCache()
+    barrier = threading.Barrier(2)
+
+    def rsi(work):
+        barrier.wait(5)  # both threads miss before either stores
+        return calculate_RSI(work)
+
+    threads = [
+        threading.Thread(target=cache.apply, args=(rsi, data.copy(), "A"))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (len(cache), cache.misses) == (1, 2)
+    assert cache.nbytes == len(data) * 8
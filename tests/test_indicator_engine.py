@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_engine import build_close_panel, compute_indicators, rolling_mean
+
+
+# =============== pandas Reference ===============
+def reference_indicators(close):
+    """The pandas formulas of the forecast pipeline for one Close series"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    rs = gain.rolling(window=14).mean() / loss.rolling(window=14).mean()
+    ema_fast = close.ewm(span=12, adjust=False).mean()
+    ema_slow = close.ewm(span=26, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    return {
+        "50MA": close.rolling(window=50).mean(),
+        "200MA": close.rolling(window=200).mean(),
+        "RSI": 100 - (100 / (1 + rs)),
+        "EMA_fast": ema_fast,
+        "EMA_slow": ema_slow,
+        "MACD": macd,
+        "MACD_signal": macd.ewm(span=9, adjust=False).mean(),
+    }
+
+
+def assert_matches(got, want):
+    want = want.to_numpy()
+    np.testing.assert_array_equal(np.isnan(got), np.isnan(want))
+    np.testing.assert_allclose(got, want, rtol=1e-9, atol=1e-9)
+
+
+# =============== Tests ===============
+def test_panel_matches_pandas_per_symbol(frames):
+    dates, symbols, close = build_close_panel(frames)
+    panel = compute_indicators(close)
+    for j, symbol in enumerate(symbols):
+        series = frames[symbol]["Close"]
+        rows = dates.get_indexer(series.index)
+        for column, want in reference_indicators(series).items():
+            assert_matches(panel[column][rows, j], want)
+
+
+def test_late_listed_symbol_has_leading_nans(frames):
+    dates, symbols, close = build_close_panel(frames)
+    panel = compute_indicators(close)
+    j = symbols.index("OLAELEC.NS")
+    first = dates.get_loc(frames["OLAELEC.NS"].index[0])
+    assert first > 0
+    for values in panel.values():
+        assert np.isnan(values[:first, j]).all()
+
+
+def test_gap_inside_history_matches_pandas():
+    rng = np.random.default_rng(0)
+    close = pd.Series(100 + rng.normal(0, 1, 400).cumsum())
+    close.iloc[[120, 121, 300]] = np.nan
+    panel = compute_indicators(close.to_numpy().reshape(-1, 1))
+    for column, want in reference_indicators(close).items():
+        assert_matches(panel[column][:, 0], want)
+
+
+@pytest.mark.parametrize("n_rows", [0, 3, 50])
+def test_rolling_mean_short_inputs(n_rows):
+    values = np.arange(n_rows, dtype=np.float64)
+    got = rolling_mean(values, 50)
+    want = pd.Series(values).rolling(50).mean().to_numpy()
+    np.testing.assert_array_equal(np.isnan(got), np.isnan(want))
+    np.testing.assert_allclose(got[~np.isnan(got)], want[~np.isnan(want)])
+
+
+@pytest.mark.parametrize("shape", [(0, 3), (0,)])
+def test_empty_panel(shape):
+    panel = compute_indicators(np.empty(shape))
+    for values in panel.values():
+        assert values.shape == shape
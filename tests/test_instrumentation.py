@@ -0,0 +1,51 @@
+import tracemalloc
+
+import pytest
+
+from instrumentation import add_hook, remove_hook, stage, trace_allocations
+from stock_forcast_by_flask import app
+
+
+@pytest.fixture
+def records():
+    records = {}
+
+    def hook(name, seconds, allocated):
+        records[name] = allocated
+
+    add_hook(hook)
+    yield records
+    remove_hook(hook)
+
+
+@pytest.fixture
+def tracing():
+    trace_allocations()
+    yield
+    tracemalloc.stop()
+
+
+def test_no_allocations_without_tracing(records):
+    with stage("work"):
+        bytearray(10**6)
+    assert records == {"work": None}
+
+
+def test_parent_stage_keeps_the_peak_of_its_children(records, tracing):
+    with stage("outer"):
+        with stage("inner"):
+            data = bytearray(10**6)
+        del data
+        with stage("small"):
+            bytearray(10)
+    assert records["inner"] >= 10**6
+    assert records["outer"] >= records["inner"]
+    assert records["small"] < 10**5
+
+
+def test_allocations_reach_server_timing_and_metrics(tracing):
+    client = app.test_client()
+    timing = client.get("/").headers["Server-Timing"]
+    assert "render;dur=" in timing and ' B"' in timing
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'stock_stage_allocated_bytes_count{stage="render"}' in metrics
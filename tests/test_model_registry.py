@@ -0,0 +1,126 @@
+import json
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+import model_registry
+from model_registry import ModelRegistry
+
+FEATURES = ["Close", "RSI"]
+PARAMS = {"backend": "random_forest", "n_estimators": 10}
+DATES = pd.date_range("2024-01-01", periods=10, tz="Asia/Kolkata")
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "models")
+
+
+def put(registry, symbol, bars=10, model=None):
+    registry.put(symbol, FEATURES, PARAMS, DATES[bars - 1], model or {"symbol": symbol})
+
+
+def pickles(root):
+    return sorted(name for name in os.listdir(root) if name.endswith(".pkl"))
+
+
+def test_fresh_model_is_reused_until_new_bars_arrive(root):
+    registry = ModelRegistry(root)
+    put(registry, "A", bars=9)
+    assert registry.get("A", FEATURES, PARAMS, DATES[:9]) == {"symbol": "A"}
+    assert registry.get("A", FEATURES, PARAMS, DATES) is None
+    assert registry.get("A", FEATURES, {"backend": "other"}, DATES[:9]) is None
+
+
+def test_get_or_train_counts_hits_and_training(root):
+    registry = ModelRegistry(root)
+    calls = []
+
+    def train():
+        calls.append(1)
+        return {"trained": len(calls)}
+
+    assert registry.get_or_train("A", FEATURES, PARAMS, DATES, train)[1] == "trained"
+    assert registry.get_or_train("A", FEATURES, PARAMS, DATES, train) == (
+        {"trained": 1},
+        "cached",
+    )
+    assert (registry.hits, registry.misses, len(calls)) == (1, 1, 1)
+    assert registry.trained["random_forest"] == 1
+
+
+def test_newer_model_supersedes_the_old_pickle(root):
+    registry = ModelRegistry(root)
+    put(registry, "A", bars=5)
+    put(registry, "A", bars=10, model={"new": True})
+    assert len(registry) == 1 and len(pickles(root)) == 1
+    assert registry.get("A", FEATURES, PARAMS, DATES) == {"new": True}
+
+
+def test_models_survive_a_restart(root):
+    put(ModelRegistry(root), "A")
+    registry = ModelRegistry(root)
+    assert registry.get("A", FEATURES, PARAMS, DATES) == {"symbol": "A"}
+
+
+def test_puts_from_two_processes_are_merged(root):
+    first, second = ModelRegistry(root), ModelRegistry(root)
+    put(first, "A")
+    put(second, "B")  # second never saw A; it must not drop it from the index
+    with open(os.path.join(root, "index.json")) as f:
+        assert sorted(meta["symbol"] for meta in json.load(f)) == ["A", "B"]
+    assert ModelRegistry(root).get("A", FEATURES, PARAMS, DATES) == {"symbol": "A"}
+
+
+def test_model_deleted_by_another_process_is_a_miss(root):
+    put(ModelRegistry(root), "A", bars=5)
+    stale = ModelRegistry(root)  # knows the bars=5 model, not loaded yet
+    put(ModelRegistry(root), "A", bars=10)
+    assert stale.get("A", FEATURES, PARAMS, DATES[:5]) is None
+    assert stale.get("A", FEATURES, PARAMS, DATES) is None  # not merged yet
+    put(stale, "B")
+    assert stale.get("A", FEATURES, PARAMS, DATES) == {"symbol": "A"}
+
+
+def test_late_put_keeps_a_newer_model(root):
+    put(ModelRegistry(root), "A", bars=10, model={"new": True})
+    late = ModelRegistry(root)
+    put(late, "A", bars=5)
+    assert late.get("A", FEATURES, PARAMS, DATES) == {"new": True}
+
+
+def test_use_order_is_shared_for_eviction(root, monkeypatch):
+    monkeypatch.setattr(model_registry, "INDEX_SYNC_SECONDS", 0)
+    writer = ModelRegistry(root, max_models=2)
+    put(writer, "A")
+    put(writer, "B")
+    reader = ModelRegistry(root, max_models=2)
+    assert reader.get("A", FEATURES, PARAMS, DATES) is not None
+    put(writer, "C")  # B is now the least recently used, in any process
+    assert sorted(entry["symbol"] for entry in writer._entries.values()) == ["A", "C"]
+    assert len(pickles(root)) == 2
+
+
+def put_many(root, worker):
+    registry = ModelRegistry(root)
+    for i in range(5):
+        put(registry, f"S{worker}-{i}")
+
+
+def test_concurrent_processes_keep_every_model(root):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=put_many, args=(root, worker)) for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+    registry = ModelRegistry(root)
+    assert len(registry) == 20
+    assert len(pickles(root)) == 20
+    for entry in list(registry._entries.values()):
+        assert registry.get(entry["symbol"], FEATURES, PARAMS, DATES) is not None
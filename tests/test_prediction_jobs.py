@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from prediction_jobs import JobQueue
+
+
+def wait(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def release():
+    return threading.Event()
+
+
+@pytest.fixture
+def queue(release):
+    calls = []
+
+    def run(key):
+        calls.append(key)
+        release.wait(5)
+        if key == "bad":
+            raise ValueError("no price data for bad")
+        return {"key": key}
+
+    queue = JobQueue(run, workers=2, max_finished=2)
+    queue.calls = calls
+    yield queue
+    release.set()
+    queue.shutdown()
+
+
+def test_simultaneous_requests_share_one_job(queue, release):
+    first = queue.submit("TCS.NS")
+    second = queue.submit("TCS.NS")
+    other = queue.submit("INFY.NS")
+    assert (first["coalesced"], second["coalesced"]) == (False, True)
+    assert second["id"] == first["id"]
+    assert other["id"] != first["id"]
+    release.set()
+    assert wait(queue, first["id"])["result"] == {"key": "TCS.NS"}
+    wait(queue, other["id"])
+    assert sorted(queue.calls) == ["INFY.NS", "TCS.NS"]
+
+
+def test_finished_key_starts_a_new_job(queue, release):
+    release.set()
+    first = queue.submit("TCS.NS")
+    wait(queue, first["id"])
+    second = queue.submit("TCS.NS")
+    assert not second["coalesced"]
+    assert second["id"] != first["id"]
+
+
+def test_failed_job_reports_the_error(queue, release):
+    release.set()
+    job = wait(queue, queue.submit("bad")["id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "no price data for bad"
+    assert job["result"] is None
+
+
+def test_only_the_newest_finished_jobs_are_kept(queue, release):
+    release.set()
+    ids = []
+    for key in ["a", "b", "c"]:
+        ids.append(queue.submit(key)["id"])
+        wait(queue, ids[-1])
+    assert queue.get(ids[0]) is None
+    assert queue.get(ids[2])["status"] == "done"
+    assert queue.get("unknown") is None
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_store import (
+    PriceStore,
+    _as_timestamp,
+    is_valid_symbol,
+    load_prices,
+    period_start,
+)
+
+SYMBOL = "TATAMOTORS.NS"
+
+
+class FrameProvider:
+    """Serves bars from a frame up to `until`, recording every request"""
+
+    def __init__(self, data, until=None):
+        self.data = data
+        self.until = until
+        self.calls = []
+
+    def history(self, symbol, start=None, period="5y"):
+        self.calls.append(start if start is not None else period)
+        data = self.data if self.until is None else self.data[: self.until]
+        if start is None:
+            start = period_start(data.index[-1], period)
+        if start is not None:
+            data = data[data.index >= _as_timestamp(start, data.index.tz)]
+        return data.copy()
+
+
+@pytest.fixture
+def data(provider):
+    return provider.history(SYMBOL, period="max")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path / "store"))
+
+
+def test_append_and_read_round_trip(store, data):
+    assert store.append(SYMBOL, data) == len(data)
+    # Stored as nanoseconds; the CSV parses to microseconds
+    pd.testing.assert_frame_equal(
+        store.read(SYMBOL), data, check_freq=False, check_index_type=False
+    )
+    assert store.first_date(SYMBOL) == data.index[0]
+    assert store.last_date(SYMBOL) == data.index[-1]
+    compact = store.read(SYMBOL, start=data.index[-10], compact=True)
+    assert len(compact) == 10
+    assert compact["Close"].dtype == np.float32
+
+
+def test_append_replaces_overlapping_bars(store, data):
+    store.append(SYMBOL, data[:-5])
+    partial = data[-6:-5].copy()
+    partial["Close"] += 1.0
+    store.append(SYMBOL, partial)
+    # The refreshed bar replaces the stored one and the tail follows it
+    store.append(SYMBOL, data[-5:])
+    assert store.row_count(SYMBOL) == len(data)
+    assert store.read(SYMBOL)["Close"].iloc[-6] == partial["Close"].iloc[0]
+    np.testing.assert_array_equal(store.read(SYMBOL)["Close"][-5:], data["Close"][-5:])
+
+
+def test_append_with_replace_truncates(store, data):
+    store.append(SYMBOL, data)
+    store.append(SYMBOL, data[-20:], replace=True)
+    assert store.row_count(SYMBOL) == 20
+    assert store.first_date(SYMBOL) == data.index[-20]
+
+
+def test_incremental_refresh_fetches_only_the_tail(store, data):
+    provider = FrameProvider(data, until=-10)
+    load_prices(SYMBOL, period="1y", store=store, provider=provider)
+    provider.until = None
+    prices = load_prices(SYMBOL, period="1y", store=store, provider=provider)
+    assert provider.calls[0] == "1y"
+    assert provider.calls[1] == data.index[-11].date()
+    assert prices.index[-1] == data.index[-1]
+    assert prices.index[0] >= period_start(data.index[-1], "1y")
+
+
+def test_longer_period_backfills_once(store, data):
+    provider = FrameProvider(data)
+    load_prices(SYMBOL, period="1y", store=store, provider=provider)
+    prices = load_prices(SYMBOL, period="3y", store=store, provider=provider)
+    wanted = period_start(data.index[-1], "3y")
+    assert provider.calls[1] == wanted.date()
+    assert prices.index[0] >= wanted
+    np.testing.assert_array_equal(prices["Close"], data["Close"][data.index >= wanted])
+    # Covered now: the next refresh only refetches the last day
+    load_prices(SYMBOL, period="2y", store=store, provider=provider)
+    assert provider.calls[2] == data.index[-1].date()
+
+
+def test_split_refetches_the_stored_history(store, data):
+    provider = FrameProvider(data, until=-10)
+    load_prices(SYMBOL, period="1y", store=store, provider=provider)
+    # A 2:1 split on the next bar: the provider re-adjusts every bar before it
+    adjusted = data.copy()
+    adjusted.iloc[:-9, :4] /= 2
+    adjusted.iloc[-9, adjusted.columns.get_loc("Stock Splits")] = 2.0
+    provider.data = adjusted
+    provider.until = None
+    prices = load_prices(SYMBOL, period="1y", store=store, provider=provider)
+    assert len(provider.calls) == 3
+    expected = adjusted[adjusted.index >= prices.index[0]]
+    np.testing.assert_array_equal(prices["Close"], expected["Close"])
+    # Stored and covered again: no further full refetch
+    load_prices(SYMBOL, period="1y", store=store, provider=provider)
+    assert len(provider.calls) == 4
+
+
+@pytest.mark.parametrize(
+    "symbol, valid",
+    [
+        ("TATAMOTORS.NS", True),
+        ("^NSEI", True),
+        ("EURINR=X", True),
+        ("BRK-B", True),
+        ("", False),
+        ("..", False),
+        ("../../tmp/x", False),
+        ("a/b", False),
+        (None, False),
+    ],
+)
+def test_symbol_validation(symbol, valid):
+    assert is_valid_symbol(symbol) is valid
+
+
+def test_invalid_symbol_never_touches_disk(store, tmp_path):
+    with pytest.raises(ValueError):
+        store.lock("../../escape")
+    with pytest.raises(ValueError):
+        load_prices("../x", store=store, provider=FrameProvider(None))
+    assert not (tmp_path / "escape").exists()
+    assert not (tmp_path / "x").exists()
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_engine import build_close_panel
+from rsi_kernel import _get_numba_kernel, _rsi_loop, rsi_kernel
+
+
+# =============== References ===============
+def pandas_sma(close, window=14):
+    """The pandas calculate_RSI formula before the kernel"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    rs = gain.rolling(window).mean() / loss.rolling(window).mean()
+    return (100 - 100 / (1 + rs)).to_numpy()
+
+
+def textbook_wilder(close, window=14):
+    """Wilder's RSI one value at a time"""
+    out = np.full(len(close), np.nan)
+    deltas = np.diff(close)
+    gains, losses = np.maximum(deltas, 0), np.maximum(-deltas, 0)
+    avg_gain, avg_loss = gains[:window].mean(), losses[:window].mean()
+    for i in range(window, len(close)):
+        if i > window:
+            avg_gain = (avg_gain * (window - 1) + gains[i - 1]) / window
+            avg_loss = (avg_loss * (window - 1) + losses[i - 1]) / window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+def python_loop(close, method):
+    """The loop kernel run as plain Python (what Numba compiles)"""
+    close = np.asarray(close, dtype=np.float64)
+    panel = close.reshape(-1, 1) if close.ndim == 1 else close
+    out = np.full(panel.shape, np.nan)
+    _rsi_loop(panel, 14, method == "wilder", out)
+    return out[:, 0] if close.ndim == 1 else out
+
+
+def assert_matches(got, want):
+    np.testing.assert_array_equal(np.isnan(got), np.isnan(want))
+    np.testing.assert_allclose(got, want, rtol=1e-9, atol=1e-9)
+
+
+ENGINES = {
+    "numpy": lambda close, method: rsi_kernel(close, method=method, engine="numpy"),
+    "loop": python_loop,
+}
+
+
+def flat_series():
+    """A rise, a flat stretch (windows without any change) and another rise"""
+    return pd.Series(np.r_[np.linspace(10, 20, 30), np.full(20, 20.0), np.arange(20.0)])
+
+
+# =============== Tests ===============
+@pytest.mark.parametrize("engine", ENGINES)
+def test_sma_matches_pandas(frames, engine):
+    for data in list(frames.values()) + [pd.DataFrame({"Close": flat_series()})]:
+        close = data["Close"]
+        assert_matches(ENGINES[engine](close.to_numpy(), "sma"), pandas_sma(close))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_wilder_matches_textbook(frames, engine):
+    for data in list(frames.values()) + [pd.DataFrame({"Close": flat_series()})]:
+        close = data["Close"].to_numpy()
+        assert_matches(ENGINES[engine](close, "wilder"), textbook_wilder(close))
+
+
+@pytest.mark.parametrize("method", ["sma", "wilder"])
+def test_panel_with_late_listed_symbol(frames, method):
+    dates, symbols, panel = build_close_panel(frames)
+    got = rsi_kernel(panel, method=method, engine="numpy")
+    assert_matches(got, python_loop(panel, method))
+    for j, symbol in enumerate(symbols):
+        rows = dates.get_indexer(frames[symbol].index)
+        assert_matches(got[rows, j], rsi_kernel(panel[rows, j], method=method))
+
+
+def test_gap_inside_history_counts_as_no_change():
+    close = pd.Series(100 + np.random.default_rng(1).normal(0, 1, 200).cumsum())
+    close.iloc[[60, 61, 150]] = np.nan
+    assert_matches(rsi_kernel(close.to_numpy(), engine="numpy"), pandas_sma(close))
+    assert_matches(python_loop(close.to_numpy(), "sma"), pandas_sma(close))
+
+
+def test_short_and_empty_inputs():
+    for n_rows in [0, 5, 14, 15]:
+        close = np.linspace(1, 2, n_rows)
+        for method in ["sma", "wilder"]:
+            got = rsi_kernel(close, method=method, engine="numpy")
+            assert_matches(got, python_loop(close, method))
+
+
+def test_rejects_unknown_method_and_engine():
+    with pytest.raises(ValueError):
+        rsi_kernel(np.arange(20.0), method="ema")
+    with pytest.raises(ValueError):
+        rsi_kernel(np.arange(20.0), engine="cuda")
+
+
+@pytest.mark.skipif(_get_numba_kernel() is not None, reason="numba is installed")
+def test_numba_engine_needs_numba():
+    with pytest.raises(ImportError):
+        rsi_kernel(np.arange(20.0), engine="numba")
+
+
+@pytest.mark.skipif(_get_numba_kernel() is None, reason="numba is not installed")
+@pytest.mark.parametrize("method", ["sma", "wilder"])
+def test_numba_matches_numpy(frames, method):
+    _, _, panel = build_close_panel(frames)
+    assert_matches(
+        rsi_kernel(panel, method=method, engine="numba"),
+        rsi_kernel(panel, method=method, engine="numpy"),
+    )
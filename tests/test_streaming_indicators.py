@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from stock_forcast import (
+    calculate_entry_stoploss,
+    calculate_MACD,
+    calculate_moving_averages,
+    calculate_RSI,
+    determin_trend,
+)
+from streaming_indicators import IndicatorState
+
+
+@pytest.fixture
+def data(provider):
+    return provider.history("TATAMOTORS.NS")
+
+
+@pytest.fixture
+def expected(data):
+    return calculate_MACD(calculate_RSI(calculate_moving_averages(data.copy())))
+
+
+def assert_row_matches(row, expected_row):
+    for column, value in row.items():
+        want = expected_row[column]
+        if math.isnan(want):
+            assert math.isnan(value), column
+        else:
+            assert math.isclose(value, want, rel_tol=1e-9), column
+
+
+def test_every_update_matches_the_batch_pipeline(data, expected):
+    state = IndicatorState()
+    for date, close in data["Close"].items():
+        assert_row_matches(state.update(close, date), expected.loc[date])
+
+
+def test_snapshot_round_trip_continues_the_stream(data, expected, tmp_path):
+    path = tmp_path / "TATAMOTORS.NS.json"
+    IndicatorState.from_history(data.iloc[:-30]).save(path)
+    state = IndicatorState.load(path)
+    for date, close in data["Close"].iloc[-30:].items():
+        assert_row_matches(state.update(close, date), expected.loc[date])
+
+
+def test_latest_frame_gives_the_same_trend_and_levels(data, expected):
+    latest = IndicatorState.from_history(data).latest_frame()
+    trend = determin_trend(latest)
+    assert trend == determin_trend(expected)
+    assert calculate_entry_stoploss(latest, trend) == calculate_entry_stoploss(
+        expected, trend
+    )
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from timeframes import BARS_PER_YEAR, BarCache, history_period, resample_bars
+
+
+@pytest.fixture
+def data(provider):
+    return provider.history("TATAMOTORS.NS")
+
+
+def minute_bars(days=20, minutes=375):
+    """One-minute bars from 09:15 IST on `days` business days"""
+    close = 100 + np.random.default_rng(0).normal(0, 0.1, days * minutes).cumsum()
+    dates = pd.bdate_range("2024-01-01", periods=days, tz="Asia/Kolkata")
+    index = dates.repeat(minutes) + pd.to_timedelta(
+        np.tile(np.arange(minutes) + 555, days), unit="min"
+    )
+    return pd.DataFrame({"Close": close, "Volume": 1}, index=index)
+
+
+def test_daily_data_is_returned_unchanged(data):
+    assert resample_bars(data, "1d") is data
+
+
+@pytest.mark.parametrize("timeframe, period", [("1wk", "W-SUN"), ("1mo", "M")])
+def test_bars_match_groupby_aggregates(data, timeframe, period):
+    bars = resample_bars(data, timeframe)
+    groups = data.groupby(data.index.tz_localize(None).to_period(period))
+    assert len(bars) == groups.ngroups
+    for column, how in [
+        ("Open", "first"),
+        ("High", "max"),
+        ("Low", "min"),
+        ("Close", "last"),
+        ("Volume", "sum"),
+    ]:
+        np.testing.assert_array_equal(bars[column], groups[column].agg(how))
+    assert bars.index.tz == data.index.tz
+    assert (bars.dtypes == data.dtypes).all()
+
+
+def test_weekly_bars_are_labelled_with_the_monday(data):
+    bars = resample_bars(data, "1wk")
+    assert (bars.index.dayofweek == 0).all()
+
+
+def test_intraday_bars_roll_up_to_one_bar_per_day():
+    minutes = minute_bars()
+    daily = resample_bars(minutes, "1d")
+    assert len(daily) == 20
+    assert (daily["Volume"] == 375).all()
+    np.testing.assert_array_equal(daily["Close"], minutes["Close"].to_numpy()[374::375])
+
+
+def test_unknown_timeframe(data):
+    with pytest.raises(ValueError):
+        resample_bars(data, "4h")
+    with pytest.raises(ValueError):
+        history_period("4h")
+
+
+@pytest.mark.parametrize(
+    "timeframe, period", [("1d", "1y"), ("1wk", "4y"), ("1mo", "17y")]
+)
+def test_history_period_holds_200_bars(timeframe, period):
+    assert history_period(timeframe) == period
+    years = int(period[:-1])
+    assert (
+        (years - 1) * BARS_PER_YEAR[timeframe] < 200 <= years * BARS_PER_YEAR[timeframe]
+    )
+
+
+def test_history_period_gives_a_200_bar_average(data):
+    # The bundled CSV holds 5 years: enough for weekly, not for monthly bars
+    weekly = resample_bars(data, "1wk")
+    assert len(weekly) >= 200
+    assert weekly["Close"].rolling(200).mean().notna().iloc[-1]
+
+
+def test_cache_hits_and_private_copies(data):
+    cache = BarCache()
+    first = cache.resample(data, "1wk", "TATAMOTORS.NS")
+    first["50MA"] = 0.0
+    again = cache.resample(data, "1wk", "TATAMOTORS.NS")
+    assert "50MA" not in again
+    assert (cache.hits, cache.misses) == (1, 1)
+    pd.testing.assert_frame_equal(again, resample_bars(data, "1wk"))
+
+
+def test_new_bar_invalidates_the_cache(data):
+    cache = BarCache()
+    cache.resample(data.iloc[:-1], "1wk", "TATAMOTORS.NS")
+    bars = cache.resample(data, "1wk", "TATAMOTORS.NS")
+    assert cache.misses == 2
+    assert bars["Close"].iloc[-1] == data["Close"].iloc[-1]
+
+
+def test_cache_is_bounded(data):
+    cache = BarCache(max_entries=2)
+    for timeframe in ["1d", "1wk", "1mo"]:
+        cache.resample(data, timeframe)
+    assert len(cache) == 2
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+import pytest
+
+from training_service import TrainingService
+
+
+@pytest.fixture
+def service():
+    service = TrainingService(workers=1, tree_jobs=1, max_finished=1)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(60, 3))
+    return X, X.sum(axis=1)
+
+
+def wait(service, job_id, timeout=60):
+    """Wait until the job has finished and its done callback has run"""
+    deadline = time.monotonic() + timeout
+    while job_id in service._jobs:
+        assert time.monotonic() < deadline, f"job {job_id} did not finish"
+        time.sleep(0.01)
+
+
+def test_train_returns_a_fitted_model(service, dataset):
+    X, y = dataset
+    model = service.train(X, y)
+    assert model.predict(X[:2]).shape == (2,)
+    assert service._jobs == {} and len(service._finished) == 0
+
+
+def test_polled_jobs_are_not_kept_forever(service, dataset):
+    X, y = dataset
+    job_ids = [service.submit(X, y) for _ in range(3)]
+    for job_id in job_ids:
+        wait(service, job_id)
+    # Only the newest finished job is kept; the others are forgotten
+    assert service._jobs == {}
+    assert list(service._finished) == job_ids[-1:]
+    assert service.status(job_ids[0]) == "unknown"
+    assert service.status(job_ids[-1]) == "done"
+    with pytest.raises(KeyError):
+        service.result(job_ids[0])
+    assert service.result(job_ids[-1]) is not None
+    assert len(service._finished) == 0
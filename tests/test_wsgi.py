@@ -0,0 +1,56 @@
+import pytest
+
+import stock_forcast_by_flask as web
+import wsgi
+from model_backends import DEFAULT_BACKEND
+
+SYMBOL = "TATAMOTORS.NS"
+
+
+@pytest.fixture
+def fetch(provider, monkeypatch):
+    """fetch_stock_data failing for the first `fetch.failures` calls"""
+
+    def fetch(symbol, compact=False):
+        fetch.calls += 1
+        if fetch.calls <= fetch.failures:
+            raise ConnectionError("price provider timed out")
+        return provider.history(symbol)
+
+    fetch.calls = 0
+    fetch.failures = 0
+    monkeypatch.setattr(web, "fetch_stock_data", fetch)
+    # No model training: these tests are about readiness, not forecasts
+    monkeypatch.setattr(
+        web,
+        "model_forecast",
+        lambda data, **kwargs: (data["Close"].iloc[-1], [], "test"),
+    )
+    web._prediction_cache.clear()
+    yield fetch
+    web._prediction_cache.clear()
+    web.warmup_failures.clear()
+    web.ready.clear()
+
+
+def warm_up():
+    wsgi.warm_up([SYMBOL], [DEFAULT_BACKEND], retries=2, retry_delay=0)
+
+
+def test_transient_failure_is_retried(fetch):
+    fetch.failures = 1
+    warm_up()
+    assert fetch.calls == 2
+    assert web.app.test_client().get("/healthz").status_code == 200
+
+
+def test_later_success_clears_a_failed_warm_up(fetch):
+    fetch.failures = 3
+    warm_up()
+    client = web.app.test_client()
+    response = client.get("/healthz")
+    assert response.status_code == 503
+    assert response.get_json()["failed"] == {f"{SYMBOL} ({DEFAULT_BACKEND})": 500}
+
+    assert client.get(f"/api/v1/predict/{SYMBOL}").status_code == 200
+    assert client.get("/healthz").status_code == 200
@@ -0,0 +1,116 @@
+"""
+Multi-timeframe bars resampled from the stored base-resolution OHLCV.
+
+Timeframes use the yfinance interval names: "1d" (intraday bars rolled up
+to one bar per local calendar day; daily data is returned as is), "1wk"
+(Monday to Sunday, labelled with the Monday) and "1mo" (calendar months,
+labelled with the first day). Periods without any trading are dropped and
+the bar still in progress is included, as Yahoo Finance reports it.
+
+The 200-bar moving average behind `determin_trend` needs
+`history_period(timeframe)` of base bars: about 4 years for weekly and 17
+years for monthly bars.
+
+Bars are built only when a timeframe is asked for, and kept in an LRU
+cache keyed by the base frame's fingerprint (see indicator_cache), so the
+indicator functions and `determin_trend` can run on weekly or monthly bars
+without another provider call and without resampling twice.
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from indicator_cache import fingerprint
+
+TIMEFRAMES = {"1d": "D", "1wk": "W-MON", "1mo": "MS"}
+BARS_PER_YEAR = {"1d": 250, "1wk": 52, "1mo": 12}
+DEFAULT_MAX_ENTRIES = int(os.environ.get("BAR_CACHE_MAX_ENTRIES", "256"))
+
+# How each column is rolled up; other columns keep their last value
+AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+    "Dividends": "sum",
+    # Split ratios are 0 on days without a split
+    "Stock Splits": "max",
+}
+
+
+def history_period(timeframe, bars=200):
+    """
+    Period (yfinance style) holding at least `bars` bars of `timeframe`,
+    e.g. "4y" for the 200-week moving average
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+    return f"{math.ceil(bars / BARS_PER_YEAR[timeframe])}y"
+
+
+def resample_bars(data, timeframe):
+    """
+    OHLCV bars of `data` at `timeframe`. Daily data asked for "1d" is
+    returned unchanged (not copied).
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+    if timeframe == "1d" and not data.index.normalize().has_duplicates:
+        return data
+    columns = {name: AGGREGATIONS.get(name, "last") for name in data.columns}
+    bars = data.resample(TIMEFRAMES[timeframe], label="left", closed="left").agg(
+        columns
+    )
+    return bars[bars["Close"].notna()]
+
+
+class BarCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> resampled frame, oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resample(self, data, timeframe, symbol=None):
+        """
+        `resample_bars(data, timeframe)`, served from the cache when the same
+        base bars were resampled before. Returns a copy the caller may modify.
+        """
+        key = (timeframe, tuple(data.columns), fingerprint(data, symbol))
+        with self._lock:
+            bars = self._entries.get(key)
+            if bars is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if bars is None:
+            bars = resample_bars(data, timeframe)
+            if bars is data:
+                bars = data.copy()
+            with self._lock:
+                self._entries[key] = bars
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return bars.copy()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = None
+
+
+def get_bar_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = BarCache()
+    return _default_cache
@@ -0,0 +1,133 @@
+"""
+Process-pool training service.
+
+Models are fitted in worker processes, so the fit itself never runs on
+the Flask request thread. Each job builds its trees in parallel: a job
+submitted while the pool is idle gets every core, and jobs submitted
+while others are in flight split the cores between the `workers` slots.
+Jobs can be awaited with `result()` (or `train()`, which blocks the
+caller for the whole fit) or polled with `status()`; request handlers
+that must not block go through the prediction job API (POST /jobs).
+Finished jobs that nobody collects are kept for the newest `max_finished`
+only, so abandoned models do not pile up.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from model_backends import DEFAULT_BACKEND
+from stock_forcast import train_model
+
+DEFAULT_WORKERS = int(os.environ.get("TRAINING_WORKERS", "2"))
+DEFAULT_MAX_FINISHED = int(os.environ.get("TRAINING_JOB_HISTORY", "16"))
+
+
+def _train_job(X, y, backend, n_jobs):
+    return train_model(X, y, backend, n_jobs=n_jobs)
+
+
+class TrainingService:
+    def __init__(
+        self, workers=DEFAULT_WORKERS, tree_jobs=None, max_finished=DEFAULT_MAX_FINISHED
+    ):
+        self.workers = max(1, workers)
+        # None: sized per job from the number of jobs in flight
+        self.tree_jobs = tree_jobs
+        self.max_finished = max_finished
+        self._pool = None
+        self._jobs = {}  # job id -> future, while queued or running
+        self._finished = OrderedDict()  # job id -> future, oldest first
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _job_tree_jobs(self):
+        """Cores for a new job: all of them when it runs alone"""
+        if self.tree_jobs is not None:
+            return self.tree_jobs
+        with self._lock:
+            in_flight = sum(not future.done() for future in self._jobs.values())
+        return max(1, (os.cpu_count() or 1) // min(self.workers, in_flight + 1))
+
+    def submit(self, X, y, backend=DEFAULT_BACKEND):
+        """Queue a training job and return its job id"""
+        future = self._executor().submit(
+            _train_job, X, y, backend, self._job_tree_jobs()
+        )
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = future
+        # Runs right away if the job has already finished
+        future.add_done_callback(lambda future: self._finish(job_id))
+        return job_id
+
+    def _finish(self, job_id):
+        """Move a finished job to `_finished`, dropping the oldest beyond the limit"""
+        with self._lock:
+            future = self._jobs.pop(job_id, None)
+            if future is None:
+                return
+            self._finished[job_id] = future
+            while len(self._finished) > self.max_finished:
+                self._finished.popitem(last=False)
+
+    def _future(self, job_id):
+        with self._lock:
+            future = self._jobs.get(job_id)
+            return future if future is not None else self._finished.get(job_id)
+
+    def status(self, job_id):
+        """Return "pending", "running", "done", "failed" or "unknown" """
+        future = self._future(job_id)
+        if future is None:
+            return "unknown"
+        if future.running():
+            return "running"
+        if not future.done():
+            return "pending"
+        return "failed" if future.exception() is not None else "done"
+
+    def result(self, job_id, timeout=None):
+        """Wait for a job and return the fitted model"""
+        future = self._future(job_id)
+        if future is None:
+            raise KeyError(job_id)
+        model = future.result(timeout=timeout)
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._finished.pop(job_id, None)
+        return model
+
+    def train(self, X, y, backend=DEFAULT_BACKEND):
+        """Submit a job and wait for its model (blocks the calling thread)"""
+        return self.result(self.submit(X, y, backend))
+
+    def train_many(self, datasets, backend=DEFAULT_BACKEND):
+        """Train one model per symbol in parallel; `datasets` maps symbol -> (X, y)"""
+        job_ids = {
+            symbol: self.submit(X, y, backend) for symbol, (X, y) in datasets.items()
+        }
+        return {symbol: self.result(job_id) for symbol, job_id in job_ids.items()}
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_default_service = None
+
+
+def get_service():
+    global _default_service
+    if _default_service is None:
+        _default_service = TrainingService()
+    return _default_service
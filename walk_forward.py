@@ -0,0 +1,142 @@
+"""
+Walk-forward evaluation of the Random Forest forecast.
+
+The feature matrix and next-day target are built once as NumPy arrays and
+shipped to each worker process once (pool initializer); every fold then
+trains on plain array slices. Folds are either "expanding" (train on all
+bars before the test window) or "rolling" (fixed-size training window).
+
+Usage:
+    python3 walk_forward.py --symbol TATAMOTORS.NS --provider csv --folds 5
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+
+from features import build_feature_matrix
+from stock_forcast import RF_PARAMS
+
+# Set in each worker process by _init_worker
+_X = None
+_y = None
+
+
+def feature_arrays(data):
+    """Contiguous (X, y, dates) arrays for next-day close prediction"""
+    fm = build_feature_matrix(data, method="recursive")
+    return fm.X_labeled, fm.y, fm.index
+
+
+def make_folds(n_rows, n_folds=5, test_size=None, mode="expanding", train_size=None):
+    """
+    Return [(train_start, test_start, test_end), ...] row ranges.
+    The test windows tile the last part of the series in time order.
+    """
+    test_size = test_size or n_rows // (n_folds + 1)
+    train_size = train_size or n_rows - n_folds * test_size
+    folds = []
+    for k in range(n_folds):
+        test_start = n_rows - (n_folds - k) * test_size
+        if test_start <= 0:
+            continue
+        train_start = 0 if mode == "expanding" else max(0, test_start - train_size)
+        folds.append((train_start, test_start, test_start + test_size))
+    return folds
+
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+
+def _run_fold(fold, params):
+    train_start, test_start, test_end = fold
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    model = RandomForestRegressor(**params, n_jobs=1)
+    model.fit(_X[train_start:test_start], _y[train_start:test_start])
+    mae = mean_absolute_error(
+        _y[test_start:test_end], model.predict(_X[test_start:test_end])
+    )
+    return {
+        "train_rows": test_start - train_start,
+        "test_rows": test_end - test_start,
+        "mae": mae,
+        "fit_seconds": time.perf_counter() - wall_start,
+        "cpu_seconds": time.process_time() - cpu_start,
+    }
+
+
+def walk_forward(data, n_folds=5, mode="expanding", workers=None, params=RF_PARAMS):
+    """
+    Train and score one forest per fold in parallel.
+    Returns (per-fold DataFrame, summary dict).
+    """
+    X, y, dates = feature_arrays(data)
+    folds = make_folds(len(X), n_folds=n_folds, mode=mode)
+    workers = workers or min(len(folds), os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(X, y)
+    ) as pool:
+        results = list(pool.map(_run_fold, folds, [params] * len(folds)))
+    wall = time.perf_counter() - start
+
+    report = pd.DataFrame(results)
+    report.insert(
+        0, "test_from", [dates[test_start].date() for _, test_start, _ in folds]
+    )
+    report.insert(
+        1, "test_to", [dates[test_end - 1].date() for _, _, test_end in folds]
+    )
+    report.index = pd.RangeIndex(1, len(report) + 1, name="Fold")
+
+    cpu = report["cpu_seconds"].sum()
+    summary = {
+        "mean_mae": report["mae"].mean(),
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "workers": workers,
+        # Busy cores on average, and as a share of the worker processes
+        "cores_busy": cpu / wall,
+        "cpu_utilisation": cpu / (wall * workers),
+    }
+    return report, summary
+
+
+if __name__ == "__main__":
+    from price_store import get_provider
+    from stock_forcast import (
+        calculate_MACD,
+        calculate_moving_averages,
+        calculate_RSI,
+        fetch_stock_data,
+    )
+
+    parser = argparse.ArgumentParser(description="Walk-forward model evaluation")
+    parser.add_argument("--symbol", default="TATAMOTORS.NS")
+    parser.add_argument("--provider", choices=["yahoo", "csv"], default=None)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--mode", choices=["expanding", "rolling"], default="expanding")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    data = fetch_stock_data(args.symbol, provider=get_provider(args.provider))
+    data = calculate_MACD(calculate_RSI(calculate_moving_averages(data)))
+    report, summary = walk_forward(data, args.folds, args.mode, args.workers)
+
+    print(report.to_string(float_format=lambda v: f"{v:.2f}"))
+    print(f"\nMean MAE: {summary['mean_mae']:.2f}")
+    print(
+        f"Wall time: {summary['wall_seconds']:.2f}s, CPU time: "
+        f"{summary['cpu_seconds']:.2f}s on {summary['workers']} workers "
+        f"({summary['cores_busy']:.1f} cores busy, "
+        f"{summary['cpu_utilisation']:.0%} utilisation)"
+    )
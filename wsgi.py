@@ -0,0 +1,94 @@
+"""
+Production entry point for the prediction dashboard.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is built by the create_app() factory (named in gunicorn.conf.py),
+so importing this module has no side effects. create_app() unpickles every
+cached model from the model registry (which also imports scikit-learn)
+and warms up the WARMUP_SYMBOLS (price store, models, compiled template
+and API response cache) before returning. With the server's preload
+option this all happens once in the master process, so the forked
+workers share it copy-on-write and start ready. /healthz answers 503
+until warm-up has finished. Server errors are retried WARMUP_RETRIES
+times; a request that still fails keeps /healthz at 503 (listing it)
+until a later prediction for that symbol and backend succeeds.
+
+WARMUP_BACKGROUND=1 warms up on a thread instead, for single-process
+servers that should accept connections straight away. TRACE_ALLOCATIONS=1
+adds the bytes each stage allocates to /metrics and Server-Timing (see
+instrumentation.py).
+"""
+
+import gc
+import os
+import threading
+import time
+
+from instrumentation import TRACE_ALLOCATIONS, trace_allocations
+from model_backends import DEFAULT_BACKEND
+from model_registry import get_registry
+from stock_forcast_by_flask import STOCKS, app, ready, warmup_failures, warmup_key
+from training_service import get_service
+
+WARMUP_SYMBOLS = os.environ.get("WARMUP_SYMBOLS", ",".join(STOCKS.values())).split(",")
+WARMUP_BACKENDS = os.environ.get("WARMUP_BACKENDS", DEFAULT_BACKEND).split(",")
+WARMUP_BACKGROUND = os.environ.get("WARMUP_BACKGROUND", "0") == "1"
+# Retries for warm-up requests that fail with a server error (fetch errors,
+# timeouts), WARMUP_RETRY_DELAY seconds apart
+WARMUP_RETRIES = int(os.environ.get("WARMUP_RETRIES", "2"))
+WARMUP_RETRY_DELAY = float(os.environ.get("WARMUP_RETRY_DELAY", "5"))
+
+
+def warm_up(
+    symbols=WARMUP_SYMBOLS,
+    backends=WARMUP_BACKENDS,
+    retries=WARMUP_RETRIES,
+    retry_delay=WARMUP_RETRY_DELAY,
+):
+    """
+    Run one request per symbol and backend through the app, then mark it
+    ready; requests that still fail after the retries are recorded for
+    /healthz
+    """
+    start = time.perf_counter()
+    warmup_failures.clear()
+    client = app.test_client()
+    client.get("/")  # compiles the dashboard template
+    for symbol in symbols:
+        for backend in backends:
+            url = f"/api/v1/predict/{symbol}?backend={backend}"
+            response = client.get(url)
+            for _ in range(retries):
+                if response.status_code < 500:
+                    break
+                time.sleep(retry_delay)
+                response = client.get(url)
+            status = "ok" if response.status_code == 200 else response.status_code
+            if response.status_code != 200:
+                warmup_failures[warmup_key(symbol, backend)] = response.status_code
+            print(f"warm-up {symbol} ({backend}): {status}", flush=True)
+    print(f"warm-up finished in {time.perf_counter() - start:.1f}s", flush=True)
+    ready.set()
+
+
+def create_app(
+    symbols=WARMUP_SYMBOLS, backends=WARMUP_BACKENDS, background=WARMUP_BACKGROUND
+):
+    """Preload models, warm up `symbols` and return the WSGI app"""
+    if TRACE_ALLOCATIONS:
+        trace_allocations()
+    get_registry().preload()
+    if background:
+        threading.Thread(target=warm_up, args=(symbols, backends), daemon=True).start()
+        return app
+
+    warm_up(symbols, backends)
+    # Workers must not inherit the master's training pool; each one starts
+    # its own on first use
+    get_service().shutdown()
+    # Keep the preloaded objects out of the collector so it does not touch
+    # (and un-share) their pages in the forked workers
+    gc.collect()
+    gc.freeze()
+    return app